@@ -0,0 +1 @@
+# Mesures de performance du tableau de bord Safran (données synthétiques, références JSON)
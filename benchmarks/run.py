@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+
+from benchmarks.synthetic import generate
+from safran.pipeline import compute_indicators, derived_columns, quarterly_summary, read_bourse_file
+from safran.shared_store import attach, publish
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000, 1_000_000]
+STAGES = ['parse', 'indicators', 'derived', 'quarterly', 'figures', 'export', 'shared_store']
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+# Graphique principal de « Vue d'ensemble » (chandeliers et moyennes mobiles), sérialisé
+# comme le fait st.plotly_chart avant l'envoi au navigateur
+def build_figures(df):
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(x=df['date'], open=df['ouv'], high=df['haut'], low=df['bas'], close=df['clot']))
+    fig.add_trace(go.Scatter(x=df['date'], y=df['MA_20']))
+    fig.add_trace(go.Scatter(x=df['date'], y=df['MA_50']))
+    fig.update_layout(template='plotly_dark', height=600, xaxis_rangeslider_visible=False)
+    return fig.to_json()
+
+
+# Export CSV de l'onglet « Données »
+def export_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def _publish_attach(df, root):
+    return attach(publish(df, root, f"bench-{time.perf_counter_ns()}"))
+
+
+# Étapes mesurées séparément : chacune reçoit la sortie de l'étape dont elle dépend.
+# Les cotations brutes sont libérées dès que les indicateurs sont calculés.
+def stages(paths, work_dir):
+    raw = {}
+    full = {}
+
+    def keep_full(out):
+        full.update(zip(paths, out))
+        raw.clear()
+
+    yield "parse", lambda: [read_bourse_file(path) for path in paths.values()], lambda out: raw.update(zip(paths, out))
+    yield "indicators", lambda: [compute_indicators(df.copy()) for df in raw.values()], keep_full
+    yield "derived", lambda: [derived_columns(df) for df in full.values()], None
+    yield "quarterly", lambda: [quarterly_summary(df) for df in full.values()], None
+    yield "figures", lambda: [build_figures(df) for df in full.values()], None
+    yield "export", lambda: [export_csv(df) for df in full.values()], None
+    yield "shared_store", lambda: [_publish_attach(df, os.path.join(work_dir, t)) for t, df in full.items()], None
+
+
+# Temps (meilleur et médian sur 'repeat' passes) puis pic d'allocation mesuré par
+# tracemalloc sur une passe supplémentaire, pour ne pas fausser les temps
+def measure(func, repeat):
+    timings = []
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func()
+        timings.append(time.perf_counter() - start)
+    del out
+    tracemalloc.start()
+    out = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, {'seconds': min(timings), 'median': statistics.median(timings), 'peak_mb': peak / 2 ** 20}
+
+
+# 'only' restreint les étapes mesurées ; celles dont dépendent les étapes retenues
+# (lecture, indicateurs) sont exécutées, les suivantes ne le sont pas
+def run(scales, tickers, repeat, data_dir, seed, only=None):
+    results = []
+    for rows in scales:
+        paths = generate(data_dir, rows, tickers, seed)
+        with tempfile.TemporaryDirectory(prefix="safran_bench_") as work_dir:
+            steps = list(stages(paths, work_dir))
+            if only:
+                last = max(i for i, (name, _, _) in enumerate(steps) if name in only)
+                steps = [step for i, step in enumerate(steps[:last + 1]) if step[0] in only or step[2] is not None]
+            for name, func, keep in steps:
+                out, stats = measure(func, repeat if rows < 1_000_000 else 1)
+                if keep is not None:
+                    keep(out)
+                results.append({'rows': rows, 'tickers': len(tickers), 'stage': name, **stats})
+                print(f"{rows:>10} x{len(tickers)} {name:<13} {stats['seconds']:9.4f} s  {stats['peak_mb']:9.1f} Mo", flush=True)
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(seed):
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'seed': seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__
+    }
+
+
+# Comparaison avec une référence : ratio des meilleurs temps par (lignes, tickers, étape).
+# Renvoie le nombre de régressions au-delà de la tolérance.
+def compare(results, baseline, tolerance):
+    reference = {(r['rows'], r['tickers'], r['stage']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\nComparaison avec {baseline['meta'].get('commit')} ({baseline['meta'].get('date')})")
+    for r in results:
+        ref = reference.get((r['rows'], r['tickers'], r['stage']))
+        if ref is None:
+            continue
+        ratio = r['seconds'] / ref['seconds'] if ref['seconds'] else float('inf')
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  RÉGRESSION"
+            regressions += 1
+        elif ratio < 1 - tolerance:
+            flag = "  gain"
+        print(f"{r['rows']:>10} x{r['tickers']} {r['stage']:<13} {ref['seconds']:9.4f} -> {r['seconds']:9.4f} s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance du pipeline Safran sur données synthétiques")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Nombres de lignes par ticker, séparés par des virgules (jusqu'à 10000000)")
+    parser.add_argument("--tickers", default="SAF", help="Tickers séparés par des virgules")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "safran_bench_data"))
+    parser.add_argument("--stages", default=None, help="Étapes mesurées, séparées par des virgules (toutes par défaut)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (défaut : baselines/<commit>.json)")
+    parser.add_argument("--append", action="store_true",
+                        help="Fusionne les résultats dans le fichier de sortie existant (mêmes lignes, tickers et étape remplacés)")
+    parser.add_argument("--compare", default=None, help="Référence JSON à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Écart relatif toléré avant de signaler une régression")
+    args = parser.parse_args()
+
+    scales = [int(float(s)) for s in args.scales.split(",")]
+    tickers = args.tickers.split(",")
+    only = set(args.stages.split(",")) if args.stages else None
+    if only and not only <= set(STAGES):
+        parser.error(f"Étapes inconnues : {', '.join(sorted(only - set(STAGES)))} (étapes : {', '.join(STAGES)})")
+    results = run(scales, tickers, args.repeat, args.data_dir, args.seed, only)
+    report = {'meta': metadata(args.seed), 'results': results}
+
+    output = args.output or os.path.join(BASELINE_DIR, f"{report['meta']['commit'] or 'local'}.json")
+    if args.append and os.path.exists(output):
+        with open(output) as f:
+            previous = json.load(f)['results']
+        measured = {(r['rows'], r['tickers'], r['stage']) for r in results}
+        kept = [r for r in previous if (r['rows'], r['tickers'], r['stage']) not in measured]
+        report['results'] = sorted(kept + results, key=lambda r: (r['rows'], r['tickers']))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
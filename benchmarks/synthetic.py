@@ -0,0 +1,104 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Séance de cotation pour les barres minute : de 9h00 à 17h30
+SESSION_MINUTES = 510
+SESSION_OPEN = pd.Timedelta(hours=9)
+CHUNK_ROWS = 1_000_000
+
+
+# Horodatages des barres : jours ouvrés (barres quotidiennes à 00:00 comme le fichier
+# d'origine) ou minutes de séance pour les grands volumes, qui dépasseraient sinon
+# les bornes de pd.Timestamp
+def resolve_freq(n, freq="auto"):
+    if freq == "auto":
+        return "B" if n <= 50_000 else "min"
+    return freq
+
+
+def bar_dates(n, start="2000-01-03", freq="auto"):
+    if resolve_freq(n, freq) == "B":
+        return pd.bdate_range(start, periods=n)
+    days = pd.bdate_range(start, periods=-(-n // SESSION_MINUTES))
+    offsets = SESSION_OPEN + pd.to_timedelta(np.arange(SESSION_MINUTES), unit="min")
+    stamps = days.values[:, None] + offsets.values[None, :]
+    return pd.DatetimeIndex(stamps.ravel()[:n])
+
+
+# Cotations OHLCV synthétiques reproductibles : marche géométrique pour la clôture,
+# ouverture proche de la clôture précédente, plus haut / plus bas englobant le corps
+def synthetic_ohlcv(n, seed=0, s0=240.0, sigma=0.015, freq="auto"):
+    rng = np.random.default_rng(seed)
+    freq = resolve_freq(n, freq)
+    # Volatilité quotidienne 'sigma' répartie sur les minutes de la séance
+    scale = sigma if freq == "B" else sigma / np.sqrt(SESSION_MINUTES)
+    close = s0 * np.exp(np.cumsum(rng.normal(0, scale, n)))
+    gap = rng.normal(0, scale / 4, n)
+    open_ = np.concatenate(([s0], close[:-1])) * np.exp(gap)
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * (1 + np.abs(rng.normal(0, scale / 2, n)))
+    low = body_low * (1 - np.abs(rng.normal(0, scale / 2, n)))
+    volume = rng.lognormal(np.log(600_000), 0.35, n).astype(np.int64)
+    return pd.DataFrame({
+        'date': bar_dates(n, freq=freq),
+        'ouv': np.round(open_, 2),
+        'haut': np.round(np.maximum(high, body_high), 2),
+        'bas': np.round(np.minimum(low, body_low), 2),
+        'clot': np.round(close, 2),
+        'vol': volume,
+        'devise': 'EUR'
+    })
+
+
+# Écriture au format exact de SAFRAN_data_bourse.txt : tabulations, tabulation finale,
+# fins de ligne CRLF, dates JJ/MM/AAAA HH:MM et nombres sans zéros superflus
+def write_bourse_file(df, path):
+    with open(path, "w", newline="") as f:
+        for i, start in enumerate(range(0, len(df), CHUNK_ROWS)):
+            chunk = df.iloc[start:start + CHUNK_ROWS].assign(**{'': ''})
+            chunk.to_csv(
+                f,
+                sep="\t",
+                index=False,
+                header=i == 0,
+                date_format="%d/%m/%Y %H:%M",
+                float_format="%.10g",
+                lineterminator="\r\n"
+            )
+    return path
+
+
+# Un fichier par ticker, chacun avec sa propre graine dérivée ; les fichiers déjà
+# générés avec les mêmes paramètres sont réutilisés
+def generate(out_dir, rows, tickers=("SAF",), seed=0, freq="auto"):
+    os.makedirs(out_dir, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(len(tickers))
+    paths = {}
+    for ticker, child in zip(tickers, seeds):
+        path = os.path.join(out_dir, f"{ticker}_{rows}_{resolve_freq(rows, freq)}_s{seed}_data_bourse.txt")
+        if not os.path.exists(path):
+            write_bourse_file(synthetic_ohlcv(rows, seed=child, freq=freq), path + ".tmp")
+            os.replace(path + ".tmp", path)
+        paths[ticker] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de cotations synthétiques au format SAFRAN_data_bourse.txt")
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--tickers", default="SAF", help="Liste séparée par des virgules")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--freq", choices=["auto", "B", "min"], default="auto")
+    parser.add_argument("--out", default="bench_data")
+    args = parser.parse_args()
+    paths = generate(args.out, args.rows, args.tickers.split(","), args.seed, args.freq)
+    for ticker, path in paths.items():
+        print(f"{ticker}: {path}")
+
+
+if __name__ == "__main__":
+    main()
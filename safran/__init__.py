@@ -0,0 +1,4 @@
+# Moteurs de calcul utilisés par le tableau de bord Safran (safran_analysis.py)
+
+# Ticker des cotations de SAFRAN_data_bourse.txt, utilisé par défaut par tous les modules
+DEFAULT_TICKER = "SAF"
@@ -0,0 +1,315 @@
+import argparse
+import json
+import queue
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from safran import DEFAULT_TICKER
+from safran.live import BAR_COLUMNS, INDICATOR_COLUMNS
+from safran.pipeline import DATA_FILE, derived_columns, load_dataset
+
+# Règles proposées par défaut (une par ligne : « nom: expression [TICKER,...] »)
+DEFAULT_RULES = """\
+RSI surachat: RSI crosses above 70
+RSI survente: RSI crosses below 30
+Cassure Bollinger haute: clot crosses above BB_Upper
+Cassure Bollinger basse: clot crosses below BB_Lower
+Croisement haussier: MA_20 crosses above MA_50
+Croisement baissier: MA_20 crosses below MA_50
+Volume anormal: vol > 2 * Volume_MA
+"""
+
+# Colonnes utilisables dans les règles : celles disponibles à la fois en direct (barres
+# et indicateurs du flux temps réel) et dans le rejeu de l'historique
+RULE_FIELDS = tuple(c for c in BAR_COLUMNS + INDICATOR_COLUMNS if c != 'date')
+
+_OPERATORS = ['crosses above', 'crosses below', 'crosses', '>=', '<=', '>', '<']
+_OPERATOR_RE = re.compile(r"\s+(" + "|".join(re.escape(op) for op in _OPERATORS) + r")\s+")
+_OPERAND_RE = re.compile(r"^(?:(?P<factor>[-+]?\d+(?:\.\d+)?)\s*[*×]\s*)?(?P<name>[A-Za-z_]\w*)$|^(?P<value>[-+]?\d+(?:\.\d+)?)$")
+_RULE_RE = re.compile(r"^(?:(?P<name>[^:]+):\s*)?(?P<expression>.+?)(?:\s*\[(?P<tickers>[^\]]*)\])?$")
+
+
+# Opérande d'une règle : colonne multipliée par un facteur (« 2 * Volume_MA ») ou constante
+@dataclass(frozen=True)
+class Operand:
+    field: str = None
+    factor: float = 1.0
+
+    def __str__(self):
+        if self.field is None:
+            return f"{self.factor:g}"
+        return self.field if self.factor == 1.0 else f"{self.factor:g} * {self.field}"
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    left: Operand
+    op: str
+    right: Operand
+    tickers: tuple = None
+
+    @property
+    def expression(self):
+        return f"{self.left} {self.op} {self.right}"
+
+    def __str__(self):
+        suffix = f" [{','.join(self.tickers)}]" if self.tickers else ""
+        return f"{self.name}: {self.expression}{suffix}"
+
+
+def _parse_operand(text):
+    match = _OPERAND_RE.match(text.strip())
+    if match is None:
+        raise ValueError(f"Opérande invalide : {text!r}")
+    if match['value'] is not None:
+        return Operand(None, float(match['value']))
+    return Operand(match['name'], float(match['factor'] or 1.0))
+
+
+# Règle au format « nom: gauche opérateur droite [TICKER,...] », par exemple
+# « RSI surachat: RSI crosses above 70 » ou « vol > 2 * Volume_MA [SAF] ». Les colonnes
+# citées doivent figurer dans 'fields' : une règle qui ne peut jamais se déclencher est refusée.
+def parse_rule(text, fields=RULE_FIELDS):
+    match = _RULE_RE.match(text.strip())
+    if match is None:
+        raise ValueError(f"Règle invalide : {text!r}")
+    parts = _OPERATOR_RE.split(match['expression'].strip(), maxsplit=1)
+    if len(parts) != 3:
+        raise ValueError(f"Opérateur manquant dans la règle : {text!r}")
+    left, op, right = parts
+    # « RSI crosses above » sans seuil serait lu comme un croisement de la colonne « above »
+    if op == 'crosses' and right.strip() in ('above', 'below'):
+        raise ValueError(f"Seuil manquant après « crosses {right.strip()} » : {text!r}")
+    tickers = None
+    if match['tickers']:
+        tickers = tuple(t.strip() for t in match['tickers'].split(",") if t.strip())
+    rule = Rule(None, _parse_operand(left), op, _parse_operand(right), tickers)
+    for operand in (rule.left, rule.right):
+        if operand.field is not None and operand.field not in fields:
+            raise ValueError(f"Colonne inconnue « {operand.field} » dans la règle : {text!r}")
+    return Rule(match['name'].strip() if match['name'] else rule.expression, rule.left, op, rule.right, tickers)
+
+
+def parse_rules(text, fields=RULE_FIELDS):
+    return [parse_rule(line, fields) for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
+# Destinations des alertes : journal JSON (une alerte par ligne) et webhook HTTP (envoi
+# asynchrone, sans bloquer l'évaluation)
+class LogSink:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, alerts):
+        with self._lock, open(self.path, "a") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class WebhookSink:
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self.errors = 0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="safran-alert-webhook", daemon=True).start()
+
+    def __call__(self, alerts):
+        self._queue.put(alerts)
+
+    def _run(self):
+        while True:
+            alerts = self._queue.get()
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps({'alerts': alerts}).encode(),
+                headers={'Content-Type': 'application/json'}
+            )
+            try:
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+            except OSError:
+                self.errors += 1
+            finally:
+                self._queue.task_done()
+
+    # Attente de l'envoi des alertes en file
+    def flush(self):
+        self._queue.join()
+
+
+# Codes des opérateurs pour l'évaluation vectorisée
+_GT, _LT, _GE, _LE, _CROSS_ABOVE, _CROSS_BELOW, _CROSS = range(7)
+_CODES = {'>': _GT, '<': _LT, '>=': _GE, '<=': _LE, 'crosses above': _CROSS_ABOVE, 'crosses below': _CROSS_BELOW, 'crosses': _CROSS}
+
+
+# Moteur d'alertes incrémental. Les règles sont compilées en tableaux (indice de colonne,
+# facteur, code d'opérateur) : une mise à jour évalue toutes les règles sur toutes les
+# nouvelles barres de l'univers en quelques opérations matricielles (règles × tickers).
+# Seules les barres arrivées sont évaluées ; la barre précédente de chaque ticker et
+# l'état de chaque couple (règle, ticker) sont conservés entre deux appels. Les
+# conditions de niveau (>, <...) ne déclenchent qu'au passage de faux à vrai.
+class AlertEngine:
+    def __init__(self, rules, sinks=(), keep=200):
+        self.sinks = list(sinks)
+        self.recent = deque(maxlen=keep)
+        self.tickers = []
+        self._rows = {}
+        self._values = np.empty((0, 0))
+        self._active = np.zeros((0, 0), dtype=bool)
+        self.rules = []
+        self.fields = []
+        self.set_rules(rules)
+
+    # Remplacement des règles : l'état des règles inchangées est conservé
+    def set_rules(self, rules):
+        rules = [parse_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+        fields = sorted({operand.field for rule in rules for operand in (rule.left, rule.right) if operand.field})
+        previous = {rule: self._active[i] for i, rule in enumerate(self.rules)}
+        values = np.full((len(self.tickers), len(fields)), np.nan)
+        for j, field in enumerate(fields):
+            if field in self.fields:
+                values[:, j] = self._values[:, self.fields.index(field)]
+        self.rules = rules
+        self.fields = fields
+        self._values = values
+        self._active = np.zeros((len(rules), len(self.tickers)), dtype=bool)
+        for i, rule in enumerate(rules):
+            if rule in previous:
+                self._active[i] = previous[rule]
+        self.fired = np.zeros(len(rules), dtype=np.int64)
+
+        # Colonne supplémentaire de 1 : une constante est un facteur appliqué à cette colonne
+        ones = len(fields)
+        self._left_index = np.array([fields.index(r.left.field) if r.left.field else ones for r in rules], dtype=np.intp)
+        self._right_index = np.array([fields.index(r.right.field) if r.right.field else ones for r in rules], dtype=np.intp)
+        self._left_factor = np.array([r.left.factor for r in rules])[:, None]
+        self._right_factor = np.array([r.right.factor for r in rules])[:, None]
+        self._codes = np.array([_CODES[r.op] for r in rules])[:, None]
+        self._filtered = [(i, r.tickers) for i, r in enumerate(rules) if r.tickers]
+
+    def _ensure_tickers(self, tickers):
+        new = [t for t in dict.fromkeys(tickers) if t not in self._rows]
+        if new:
+            for ticker in new:
+                self._rows[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+            self._values = np.vstack([self._values, np.full((len(new), len(self.fields)), np.nan)])
+            self._active = np.hstack([self._active, np.zeros((len(self.rules), len(new)), dtype=bool)])
+        return np.array([self._rows[t] for t in tickers], dtype=np.intp)
+
+    def _sides(self, values):
+        augmented = np.hstack([values, np.ones((len(values), 1))])
+        return self._left_factor * augmented[:, self._left_index].T, self._right_factor * augmented[:, self._right_index].T
+
+    # Nouvelles barres : DataFrame indexé par ticker (une ligne par ticker ayant reçu une
+    # barre) contenant les colonnes utilisées par les règles. Renvoie les alertes émises.
+    # notify=False met l'état à jour sans émettre (amorçage sur l'historique).
+    def update(self, bars, timestamp=None, notify=True):
+        if not len(bars) or not self.rules:
+            return []
+        tickers = list(bars.index)
+        rows = self._ensure_tickers(tickers)
+        current = bars.reindex(columns=self.fields).to_numpy(dtype=float)
+        left, right = self._sides(current)
+        prev_left, prev_right = self._sides(self._values[rows])
+        codes = self._codes
+
+        above, below = left > right, left < right
+        condition = np.select(
+            [codes == _GT, codes == _LT, codes == _GE, codes == _LE, codes == _CROSS_ABOVE, codes == _CROSS_BELOW],
+            [above, below, left >= right, left <= right, above, below],
+            default=above | below
+        )
+        crossed_above = above & (prev_left <= prev_right)
+        crossed_below = below & (prev_left >= prev_right)
+        active = self._active[:, rows]
+        fire = np.select(
+            [codes <= _LE, codes == _CROSS_ABOVE, codes == _CROSS_BELOW],
+            [condition & ~active, crossed_above, crossed_below],
+            default=crossed_above | crossed_below
+        )
+        for i, allowed in self._filtered:
+            fire[i] &= np.isin(tickers, allowed)
+
+        self._active[:, rows] = condition
+        self._values[rows] = current
+        if not notify:
+            return []
+
+        rule_idx, ticker_idx = np.nonzero(fire)
+        self.fired += np.bincount(rule_idx, minlength=len(self.rules))
+        when = str(pd.Timestamp(timestamp)) if timestamp is not None else time.strftime("%Y-%m-%d %H:%M:%S")
+        alerts = [
+            {
+                'time': when,
+                'ticker': str(tickers[j]),
+                'rule': self.rules[i].name,
+                'expression': self.rules[i].expression,
+                'left': float(left[i, j]),
+                'right': float(right[i, j])
+            }
+            for i, j in zip(rule_idx.tolist(), ticker_idx.tolist())
+        ]
+        if alerts:
+            self.recent.extend(alerts)
+            for sink in self.sinks:
+                sink(alerts)
+        return alerts
+
+
+# Colonnes disponibles pour les règles : indicateurs du jeu de données et colonnes dérivées
+def alert_frame(df):
+    return df.join(derived_columns(df))
+
+
+# Rejeu de l'historique de plusieurs tickers, date par date, comme si les barres
+# arrivaient en direct (utile pour valider un jeu de règles)
+def replay(engine, frames):
+    panel = pd.concat(
+        {ticker: alert_frame(df).set_index('date') for ticker, df in frames.items()},
+        names=['ticker', 'date']
+    ).swaplevel().sort_index()
+    alerts = []
+    for date, bars in panel.groupby(level='date', sort=True):
+        alerts.extend(engine.update(bars.droplevel('date'), timestamp=date))
+    return alerts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Évaluation des règles d'alerte sur l'historique des cotations")
+    parser.add_argument("--rules", default=None, help="Fichier de règles (une par ligne), règles par défaut sinon")
+    parser.add_argument("--file", action="append", default=[], metavar="TICKER=FICHIER")
+    parser.add_argument("--log", default="alerts.log", help="Journal des alertes (JSON, une par ligne)")
+    parser.add_argument("--webhook", default=None, help="URL recevant les alertes en POST")
+    args = parser.parse_args()
+
+    rules = DEFAULT_RULES
+    if args.rules:
+        with open(args.rules) as f:
+            rules = f.read()
+    files = dict(item.split("=", 1) for item in args.file) or {DEFAULT_TICKER: DATA_FILE}
+    sinks = [LogSink(args.log)]
+    webhook = WebhookSink(args.webhook) if args.webhook else None
+    if webhook is not None:
+        sinks.append(webhook)
+
+    engine = AlertEngine(parse_rules(rules), sinks)
+    alerts = replay(engine, {ticker: load_dataset(path) for ticker, path in files.items()})
+    for rule, count in zip(engine.rules, engine.fired):
+        print(f"{count:6d}  {rule.name} ({rule.expression})")
+    print(f"{len(alerts)} alertes écrites dans {args.log}")
+    if webhook is not None:
+        webhook.flush()
+
+
+if __name__ == "__main__":
+    main()
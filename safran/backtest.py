@@ -0,0 +1,252 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Mémoire totale allouée au balayage (tous processus confondus) et mémoire de travail
+# mesurée par élément (combinaison × barre) : positions, rendements, capital et
+# temporaires de construction des signaux
+_MEMORY_BUDGET = 1 << 30
+_BYTES_PER_ELEMENT = 32
+# En dessous de ce nombre de combinaisons, le pool de processus coûte plus qu'il ne rapporte
+_PARALLEL_MIN_COMBINATIONS = 5_000
+
+METRICS = ('total_return', 'sharpe', 'max_drawdown', 'trades', 'exposure')
+
+
+# Moyennes et écarts-types glissants pour plusieurs fenêtres (une ligne par fenêtre),
+# obtenus à partir d'une seule paire de sommes cumulées
+def rolling_mean_std(values, windows):
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    offset = values.mean() if n else 0.0
+    centered = values - offset
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csum2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    means = np.full((len(windows), n), np.nan)
+    stds = np.full((len(windows), n), np.nan)
+    for i, w in enumerate(int(w) for w in windows):
+        if w > n or w < 2:
+            continue
+        s1 = csum[w:] - csum[:-w]
+        s2 = csum2[w:] - csum2[:-w]
+        mean = s1 / w
+        means[i, w - 1:] = mean + offset
+        stds[i, w - 1:] = np.sqrt(np.maximum((s2 - w * mean ** 2) / (w - 1), 0.0))
+    return means, stds
+
+
+# RSI à moyennes simples (même définition que load_data) pour plusieurs périodes
+def rsi_matrix(close, periods):
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, prepend=np.nan)
+    delta[0] = 0.0
+    gains = np.concatenate(([0.0], np.cumsum(np.maximum(delta, 0.0))))
+    losses = np.concatenate(([0.0], np.cumsum(np.maximum(-delta, 0.0))))
+    out = np.full((len(periods), len(close)), np.nan)
+    for i, p in enumerate(int(p) for p in periods):
+        if p + 1 > len(close):
+            continue
+        gain = (gains[p + 1:] - gains[1:-p]) / p
+        loss = (losses[p + 1:] - losses[1:-p]) / p
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[i, p:] = 100 - 100 / (1 + gain / loss)
+    return out
+
+
+# Propagation vers l'avant du dernier signal d'entrée (1) ou de sortie (0) ;
+# -1 signifie « pas de nouveau signal » et la position reste plate avant le premier
+def _hold_signals(events):
+    positions = np.arange(events.shape[-1])
+    idx = np.where(events >= 0, positions, 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    held = np.take_along_axis(events, idx, axis=-1)
+    del idx
+    return (held > 0).astype(float)
+
+
+# Positions (0 = hors marché, 1 = acheteur) pour chaque combinaison de paramètres.
+# La grille est évaluée par diffusion sur les axes de paramètres.
+def _ma_positions(close, fast, slow):
+    fast_ma, _ = rolling_mean_std(close, fast)
+    slow_ma, _ = rolling_mean_std(close, slow)
+    positions = (fast_ma[:, None, :] > slow_ma[None, :, :]).astype(float)
+    # Une moyenne « rapide » plus longue que la « lente » n'a pas de sens
+    positions[np.asarray(fast)[:, None] >= np.asarray(slow)[None, :]] = np.nan
+    return positions
+
+
+def _rsi_positions(close, periods, lowers, uppers):
+    rsi = rsi_matrix(close, periods)[:, None, None, :]
+    low = np.asarray(lowers, dtype=float)[None, :, None, None]
+    high = np.asarray(uppers, dtype=float)[None, None, :, None]
+    # Achat en survente, sortie en surachat
+    events = np.full(np.broadcast_shapes(rsi.shape, low.shape, high.shape), -1, dtype=np.int8)
+    events[np.broadcast_to(rsi > high, events.shape)] = 0
+    events[np.broadcast_to(rsi < low, events.shape)] = 1
+    positions = _hold_signals(events)
+    positions[:, np.asarray(lowers)[:, None] >= np.asarray(uppers)[None, :]] = np.nan
+    return positions
+
+
+def _bollinger_positions(close, windows, widths):
+    close = np.asarray(close, dtype=float)
+    middle, std = rolling_mean_std(close, windows)
+    lower = middle[:, None, :] - np.asarray(widths, dtype=float)[None, :, None] * std[:, None, :]
+    # Retour à la moyenne : achat sous la bande inférieure, sortie sur la moyenne mobile
+    events = np.full(lower.shape, -1, dtype=np.int8)
+    events[np.broadcast_to(close > middle[:, None, :], events.shape)] = 0
+    events[close < lower] = 1
+    del lower
+    return _hold_signals(events)
+
+
+_STRATEGIES = {
+    'ma_crossover': (_ma_positions, ('fast', 'slow')),
+    'rsi': (_rsi_positions, ('period', 'lower', 'upper')),
+    'bollinger': (_bollinger_positions, ('window', 'width'))
+}
+
+
+# Métriques de performance le long de l'axe temporel pour toute la grille. Les calculs
+# sont faits en place pour limiter la mémoire de travail à quelques tableaux de la
+# taille de la grille.
+def _evaluate(positions, close, cost_bps, periods_per_year):
+    invalid = np.isnan(positions[..., 0])
+    positions = np.nan_to_num(positions, copy=False)
+    exposure = positions.mean(axis=-1)
+    trades = (positions[..., 1:] > positions[..., :-1]).sum(axis=-1) + (positions[..., 0] > 0)
+
+    asset = np.diff(close) / close[:-1]
+    held = positions[..., :-1]
+    turnover = np.empty_like(held)
+    turnover[..., 0] = held[..., 0]
+    np.subtract(held[..., 1:], held[..., :-1], out=turnover[..., 1:])
+    np.abs(turnover, out=turnover)
+    turnover *= cost_bps / 10_000
+    returns = held * asset
+    returns -= turnover
+    del turnover, held, positions
+
+    std = returns.std(axis=-1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, returns.mean(axis=-1) / std * np.sqrt(periods_per_year), 0.0)
+
+    # Capital (en place sur les rendements) puis drawdown maximal
+    equity = returns
+    equity += 1
+    np.multiply.accumulate(equity, axis=-1, out=equity)
+    drawdown = np.maximum.accumulate(equity, axis=-1)
+    np.divide(equity, drawdown, out=drawdown)
+
+    metrics = {
+        'total_return': equity[..., -1] - 1,
+        'sharpe': sharpe,
+        'max_drawdown': drawdown.min(axis=-1) - 1,
+        'trades': trades.astype(float),
+        'exposure': exposure
+    }
+    for values in metrics.values():
+        values[invalid] = np.nan
+    return metrics
+
+
+# Évaluation d'une sous-grille de paramètres ;
+# fonction de module pour pouvoir être exécutée dans un pool de processus
+def _sweep_block(strategy, close, axes, cost_bps, periods_per_year):
+    build, _ = _STRATEGIES[strategy]
+    return _evaluate(build(close, *axes), close, cost_bps, periods_per_year)
+
+
+@dataclass
+class SweepResult:
+    strategy: str
+    axes: dict
+    metrics: dict
+    close: np.ndarray
+    cost_bps: float = 0.0
+    periods_per_year: int = 252
+
+    # Résultats à plat, une ligne par combinaison (pour les tableaux et cartes de chaleur)
+    def to_frame(self):
+        grid = pd.MultiIndex.from_product(list(self.axes.values()), names=list(self.axes))
+        frame = pd.DataFrame({name: values.ravel() for name, values in self.metrics.items()}, index=grid)
+        return frame.dropna(subset=['sharpe']).reset_index()
+
+    # Meilleures combinaisons selon une métrique
+    def top(self, metric='sharpe', n=5):
+        return self.to_frame().nlargest(n, metric)
+
+    # Courbe de capital d'une combinaison, recalculée sur ses seuls paramètres
+    def equity_curve(self, **params):
+        build, names = _STRATEGIES[self.strategy]
+        positions = np.nan_to_num(build(self.close, *[[params[name]] for name in names]).reshape(-1))
+        asset = np.diff(self.close) / self.close[:-1]
+        turnover = np.abs(np.diff(positions[:-1], prepend=0))
+        returns = positions[:-1] * asset - turnover * self.cost_bps / 10_000
+        return np.concatenate(([1.0], np.cumprod(1 + returns)))
+
+
+# Découpage d'une grille (tailles des axes) en sous-grilles d'au plus 'limit'
+# combinaisons. Les axes sont découpés de gauche à droite : un axe n'est divisé que si
+# un seul pas de l'axe précédent dépasse déjà la limite.
+def _grid_blocks(sizes, limit):
+    steps = []
+    for i, size in enumerate(sizes):
+        inner = int(np.prod(sizes[i + 1:], dtype=np.int64))
+        if limit >= inner:
+            steps.append(min(size, limit // inner))
+            steps.extend(sizes[i + 1:])
+            break
+        steps.append(1)
+    ranges = [[slice(start, min(start + step, size)) for start in range(0, size, step)]
+              for size, step in zip(sizes, steps)]
+    return list(itertools.product(*ranges))
+
+
+# Balayage d'une grille de paramètres pour une stratégie. La grille est découpée en
+# sous-grilles dont la mémoire de travail tient dans la part du budget de chaque
+# processus ; le nombre de processus est réduit si une seule combinaison n'y tient pas.
+def sweep(strategy, close, cost_bps=0.0, n_jobs=1, periods_per_year=252, **axes):
+    if strategy not in _STRATEGIES:
+        raise ValueError(f"Stratégie inconnue : {strategy}")
+    _, names = _STRATEGIES[strategy]
+    missing = [name for name in names if name not in axes]
+    if missing:
+        raise ValueError(f"Paramètres manquants pour {strategy} : {', '.join(missing)}")
+    close = np.asarray(close, dtype=float)
+    axes = {name: list(axes[name]) for name in names}
+    sizes = [len(axes[name]) for name in names]
+    combinations = int(np.prod(sizes))
+
+    row_bytes = _BYTES_PER_ELEMENT * max(len(close), 1)
+    workers = 1
+    if n_jobs > 1 and combinations >= _PARALLEL_MIN_COMBINATIONS:
+        workers = int(min(n_jobs, max(1, _MEMORY_BUDGET // row_bytes)))
+    limit = max(1, min(_MEMORY_BUDGET // workers // row_bytes, -(-combinations // workers)))
+    grid = _grid_blocks(sizes, limit)
+    blocks = [(strategy, close, [axes[name][part] for name, part in zip(names, parts)], cost_bps, periods_per_year)
+              for parts in grid]
+
+    if workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_sweep_block, *zip(*blocks)))
+    else:
+        results = [_sweep_block(*block) for block in blocks]
+
+    metrics = {name: np.empty(sizes) for name in METRICS}
+    for parts, result in zip(grid, results):
+        for name in METRICS:
+            metrics[name][parts] = result[name]
+    return SweepResult(strategy, axes, metrics, close, cost_bps, periods_per_year)
+
+
+# Liste de valeurs régulièrement espacées (bornes incluses) pour construire une grille
+def param_range(start, stop, step):
+    if all(isinstance(v, int) for v in (start, stop, step)):
+        return list(range(start, stop + 1, step))
+    values = np.arange(start, stop + step / 2, step)
+    return [round(v.item(), 10) for v in values]
+
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+# Lissage exponentiel y[t] = alpha * x[t] + (1 - alpha) * y[t-1] évalué comme un
+# filtre récursif (lfilter) ; 'previous' est la valeur lissée avant le premier point
+def _smooth(values, alpha, previous):
+    if len(values) == 0:
+        return np.empty(0)
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * previous])
+    return y
+
+
+def _first_valid(values):
+    valid = np.flatnonzero(~np.isnan(values))
+    return valid[0] if len(valid) else len(values)
+
+
+# Moyenne mobile exponentielle (même convention que pandas ewm(span, adjust=False)).
+# run() calcule toute la série ; update() ajoute une barre en O(1).
+class EMA:
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = np.nan
+
+    def run(self, values):
+        values = np.asarray(values, dtype=float)
+        out = np.full(len(values), np.nan)
+        start = _first_valid(values)
+        if start < len(values):
+            out[start:] = _smooth(values[start:], self.alpha, values[start])
+            self.value = out[-1]
+        return out
+
+    def update(self, x):
+        if np.isnan(self.value):
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+# RSI lissé à la Wilder : moyennes simples des gains/pertes sur la première période,
+# puis lissage exponentiel de coefficient 1 / période
+class WilderRSI:
+    def __init__(self, period=14):
+        self.period = period
+        self.alpha = 1.0 / period
+        self.last_price = np.nan
+        self.avg_gain = np.nan
+        self.avg_loss = np.nan
+        self._warmup = []
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+    def run(self, values):
+        values = np.asarray(values, dtype=float)
+        out = np.full(len(values), np.nan)
+        self._warmup = []
+        start = _first_valid(values)
+        prices = values[start:]
+        if len(prices) == 0:
+            return out
+        self.last_price = prices[-1]
+        delta = np.diff(prices)
+        gains = np.maximum(delta, 0.0)
+        losses = np.maximum(-delta, 0.0)
+        if len(delta) < self.period:
+            self._warmup = list(delta)
+            return out
+
+        seed_gain = gains[:self.period].mean()
+        seed_loss = losses[:self.period].mean()
+        avg_gain = np.concatenate(([seed_gain], _smooth(gains[self.period:], self.alpha, seed_gain)))
+        avg_loss = np.concatenate(([seed_loss], _smooth(losses[self.period:], self.alpha, seed_loss)))
+        self.avg_gain, self.avg_loss = avg_gain[-1], avg_loss[-1]
+        out[start + self.period:] = self._rsi(avg_gain, avg_loss)
+        return out
+
+    def update(self, price):
+        if np.isnan(self.last_price):
+            self.last_price = float(price)
+            return np.nan
+        delta = price - self.last_price
+        self.last_price = float(price)
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if np.isnan(self.avg_gain):
+            self._warmup.append(delta)
+            if len(self._warmup) < self.period:
+                return np.nan
+            warmup = np.asarray(self._warmup)
+            self.avg_gain = np.maximum(warmup, 0.0).mean()
+            self.avg_loss = np.maximum(-warmup, 0.0).mean()
+            self._warmup = []
+        else:
+            self.avg_gain += self.alpha * (gain - self.avg_gain)
+            self.avg_loss += self.alpha * (loss - self.avg_loss)
+        return float(self._rsi(self.avg_gain, self.avg_loss))
+
+
+# MACD : différence de deux EMA, ligne de signal (EMA du MACD) et histogramme
+class MACD:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def run(self, values):
+        macd = self.fast.run(values) - self.slow.run(values)
+        signal = self.signal.run(macd)
+        return pd.DataFrame({'MACD': macd, 'MACD_Signal': signal, 'MACD_Hist': macd - signal})
+
+    def update(self, x):
+        macd = float(self.fast.update(x) - self.slow.update(x))
+        signal = float(self.signal.update(macd))
+        return {'MACD': macd, 'MACD_Signal': signal, 'MACD_Hist': macd - signal}
+
+
+# Ruban de moyennes exponentielles : une colonne par période
+def ema_ribbon(values, spans):
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.DataFrame({f'EMA_{span}': EMA(span).run(values) for span in spans}, index=index)
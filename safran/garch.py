@@ -0,0 +1,188 @@
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+
+from safran import DEFAULT_TICKER
+from safran.pipeline import DATA_FILE, load_dataset
+
+# Coefficient de lissage RiskMetrics pour des données quotidiennes
+RISKMETRICS_LAMBDA = 0.94
+_LOG_2PI = np.log(2 * np.pi)
+
+
+# Récurrence de variance σ²[t] = ω + α ε²[t-1] + β σ²[t-1] évaluée comme un filtre
+# linéaire récursif (scipy.signal.lfilter) ; σ²[0] est la variance initiale.
+# La série renvoyée a la longueur de 'eps'.
+def garch_variance(eps, omega, alpha, beta, initial):
+    eps2 = np.asarray(eps, dtype=float) ** 2
+    variance = np.empty(len(eps2))
+    if len(eps2) == 0:
+        return variance
+    variance[0] = initial
+    if len(eps2) > 1:
+        variance[1:], _ = lfilter([1.0], [1.0, -beta], omega + alpha * eps2[:-1], zi=[beta * initial])
+    return variance
+
+
+# EWMA / RiskMetrics : cas particulier ω = 0, α = 1 - λ, β = λ
+def ewma_variance(eps, lam=RISKMETRICS_LAMBDA, initial=None):
+    eps = np.asarray(eps, dtype=float)
+    if initial is None:
+        initial = np.mean(eps ** 2) if len(eps) else np.nan
+    return garch_variance(eps, 0.0, 1 - lam, lam, initial)
+
+
+def _neg_loglik(theta, eps, scale, initial):
+    omega, alpha, beta = theta[0] * scale, theta[1], theta[2]
+    variance = garch_variance(eps, omega, alpha, beta, initial)
+    if not np.all(variance > 0):
+        return np.inf
+    return 0.5 * np.sum(_LOG_2PI + np.log(variance) + eps ** 2 / variance)
+
+
+@dataclass
+class GarchFit:
+    mu: float
+    omega: float
+    alpha: float
+    beta: float
+    loglik: float
+    nobs: int
+    converged: bool
+    iterations: int
+    variance: np.ndarray = field(repr=False)
+    last_eps: float = field(repr=False, default=np.nan)
+
+    @property
+    def persistence(self):
+        return self.alpha + self.beta
+
+    @property
+    def long_run_variance(self):
+        return self.omega / (1 - self.persistence) if self.persistence < 1 else np.inf
+
+    # Nombre de barres pour que l'écart à la variance de long terme soit divisé par deux
+    @property
+    def half_life(self):
+        return np.log(0.5) / np.log(self.persistence) if 0 < self.persistence < 1 else np.inf
+
+    # Variance prévue de la prochaine barre (connue à la clôture de la dernière)
+    @property
+    def next_variance(self):
+        return self.omega + self.alpha * self.last_eps ** 2 + self.beta * self.variance[-1]
+
+    # Volatilité prévue pour les 'horizon' prochaines barres :
+    # σ²[t+h] = σ̄² + (α + β)^(h-1) (σ²[t+1] - σ̄²)
+    def forecast(self, horizon):
+        steps = np.arange(horizon)
+        if self.persistence < 1:
+            long_run = self.long_run_variance
+            variance = long_run + self.persistence ** steps * (self.next_variance - long_run)
+        else:
+            variance = self.next_variance + self.omega * steps
+        return np.sqrt(variance)
+
+
+# Ajustement GARCH(1,1) gaussien par maximum de vraisemblance (SLSQP, α + β < 1).
+# 'previous' (ajustement précédent du même instrument) sert de point de départ : à
+# l'arrivée de nouvelles barres, l'optimiseur converge en quelques itérations.
+def fit_garch(returns, previous=None):
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    if len(returns) < 10:
+        raise ValueError("Au moins 10 rendements sont nécessaires pour ajuster un GARCH(1,1)")
+    mu = returns.mean()
+    eps = returns - mu
+    sample_variance = eps.var()
+    scale = sample_variance if sample_variance > 0 else 1.0
+
+    # ω est optimisé en unités de la variance de l'échantillon pour un problème bien conditionné
+    if previous is not None:
+        x0 = [previous.omega / scale, previous.alpha, previous.beta]
+    else:
+        x0 = [0.05, 0.05, 0.90]
+    x0 = np.clip(x0, [1e-6, 1e-6, 1e-6], [10.0, 0.5, 0.999])
+    if x0[1] + x0[2] >= 0.999:
+        x0[2] = 0.998 - x0[1]
+
+    result = minimize(
+        _neg_loglik,
+        x0,
+        args=(eps, scale, sample_variance),
+        method='SLSQP',
+        bounds=[(1e-8, 10.0), (0.0, 1.0), (0.0, 1.0)],
+        constraints=[{'type': 'ineq', 'fun': lambda theta: 0.9999 - theta[1] - theta[2]}],
+        options={'maxiter': 200, 'ftol': 1e-9}
+    )
+    omega, alpha, beta = result.x[0] * scale, result.x[1], result.x[2]
+    return GarchFit(
+        mu=float(mu),
+        omega=float(omega),
+        alpha=float(alpha),
+        beta=float(beta),
+        loglik=float(-result.fun),
+        nobs=len(eps),
+        converged=bool(result.success),
+        iterations=int(result.nit),
+        variance=garch_variance(eps, omega, alpha, beta, sample_variance),
+        last_eps=float(eps[-1])
+    )
+
+
+# Cache LRU borné des ajustements, indexé par (ticker, version des données) et partagé
+# entre threads : l'ajustement le plus récent d'un ticker sert de point de départ de
+# l'optimiseur pour une nouvelle version
+class GarchCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ticker, version, returns):
+        key = (ticker, version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            previous = next((fit for (t, _), fit in reversed(self._entries.items()) if t == ticker), None)
+        # Ajustement hors verrou : les autres sessions ne sont pas bloquées pendant ce temps
+        fit = fit_garch(returns, previous=previous)
+        with self._lock:
+            self._entries[key] = fit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fit
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajustement GARCH(1,1) des rendements quotidiens")
+    parser.add_argument("--file", action="append", default=[], metavar="TICKER=FICHIER")
+    parser.add_argument("--horizon", type=int, default=20)
+    args = parser.parse_args()
+
+    files = dict(item.split("=", 1) for item in args.file) or {DEFAULT_TICKER: DATA_FILE}
+    for ticker, path in files.items():
+        returns = load_dataset(path)['Daily_Return']
+        start = time.perf_counter()
+        fit = fit_garch(returns)
+        elapsed = time.perf_counter() - start
+        forecast = fit.forecast(args.horizon) * np.sqrt(252)
+        print(
+            f"{ticker}: ω={fit.omega:.4f} α={fit.alpha:.3f} β={fit.beta:.3f} "
+            f"persistance={fit.persistence:.3f} vol. annualisée J+1={forecast[0]:.1f}% "
+            f"J+{args.horizon}={forecast[-1]:.1f}% ({fit.iterations} itérations, {elapsed * 1000:.0f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from safran.ema import WilderRSI
+from safran.rolling import rolling_linregress
+
+
+def moving_average(df, window):
+    return df['clot'].rolling(window=window).mean()
+
+
+# Bandes de Bollinger : moyenne sur 'window' barres ± 'width' écarts-types
+def bollinger(df, window, width):
+    middle = df['clot'].rolling(window=window).mean()
+    std = df['clot'].rolling(window=window).std()
+    return pd.DataFrame({
+        'BB_Middle': middle,
+        'BB_Upper': middle + width * std,
+        'BB_Lower': middle - width * std
+    }, index=df.index)
+
+
+# RSI à moyennes simples, comme la colonne 'RSI' de compute_indicators()
+def rsi(df, period):
+    delta = df['clot'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def rsi_wilder(df, period):
+    return pd.Series(WilderRSI(period).run(df['clot']), index=df.index)
+
+
+def momentum(df, period):
+    return df['clot'] - df['clot'].shift(period)
+
+
+# Droite de tendance ajustée sur les 'window' dernières barres
+def trend(df, window):
+    window = min(window, len(df))
+    return rolling_linregress(df['clot'].values[-window:], window).iloc[-1]
+
+
+INDICATORS = {
+    'moving_average': moving_average,
+    'bollinger': bollinger,
+    'rsi': rsi,
+    'rsi_wilder': rsi_wilder,
+    'momentum': momentum,
+    'trend': trend
+}
+
+
+# Barres à lire avant la période affichée pour que bandes de Bollinger et RSI y soient
+# ceux de l'historique complet : exact pour les fenêtres glissantes ; pour le RSI de
+# Wilder, l'effet de l'amorçage décroît en (1 - 1/période)^n, soit e^-20 après 20 périodes
+def warmup_bars(bb_window, rsi_period):
+    return max(bb_window, 20 * rsi_period)
+
+
+# Cache LRU borné des séries calculées, indexé par (empreinte du jeu de données,
+# indicateur, paramètres) : revenir à un réglage déjà vu ne recalcule rien, et seul
+# l'indicateur dont un paramètre change est recalculé
+class IndicatorCache:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint, name, df, **params):
+        key = (fingerprint, name, tuple(sorted(params.items())))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées pendant ce temps
+        value = INDICATORS[name](df, **params)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
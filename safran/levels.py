@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+
+# Extrema glissants centrés en O(n) : les filtres de scipy.ndimage reposent sur une
+# file monotone (deque), le coût ne dépend donc pas de la taille de la fenêtre
+def sliding_max(values, window):
+    return maximum_filter1d(np.asarray(values, dtype=float), size=window, mode='nearest')
+
+
+def sliding_min(values, window):
+    return minimum_filter1d(np.asarray(values, dtype=float), size=window, mode='nearest')
+
+
+# Extrema sur les 'window' dernières barres (fenêtre glissante arrière), NaN tant que
+# la fenêtre n'est pas complète
+def trailing_max(values, window):
+    out = maximum_filter1d(np.asarray(values, dtype=float), size=window, origin=(window - 1) // 2, mode='nearest')
+    out[:window - 1] = np.nan
+    return out
+
+
+def trailing_min(values, window):
+    out = minimum_filter1d(np.asarray(values, dtype=float), size=window, origin=(window - 1) // 2, mode='nearest')
+    out[:window - 1] = np.nan
+    return out
+
+
+# Points pivots : barre égale à l'extremum des 'order' barres de part et d'autre.
+# Les barres des bords, non encore confirmées, sont exclues ; sur un plateau seule
+# la première barre est retenue.
+def find_pivots(high, low, order=5):
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = len(high)
+    window = 2 * order + 1
+    confirmed = np.zeros(n, dtype=bool)
+    confirmed[order:n - order] = True
+    new_high = np.concatenate(([True], high[1:] != high[:-1]))
+    new_low = np.concatenate(([True], low[1:] != low[:-1]))
+    pivot_highs = np.flatnonzero(confirmed & new_high & (high == sliding_max(high, window)))
+    pivot_lows = np.flatnonzero(confirmed & new_low & (low == sliding_min(low, window)))
+    return pivot_highs, pivot_lows
+
+
+# Regroupement des prix pivots proches (écart relatif inférieur à 'tolerance') :
+# un tri puis une coupure à chaque écart trop grand, sans comparer toutes les paires
+def cluster_levels(prices, positions, tolerance=0.01):
+    prices = np.asarray(prices, dtype=float)
+    positions = np.asarray(positions)
+    if len(prices) == 0:
+        return pd.DataFrame(columns=['price', 'touches', 'last_touch'])
+    order = np.argsort(prices)
+    sorted_prices = prices[order]
+    gaps = np.diff(sorted_prices) / sorted_prices[:-1]
+    cluster = np.concatenate(([0], np.cumsum(gaps > tolerance)))
+    return pd.DataFrame({
+        'price': sorted_prices,
+        'cluster': cluster,
+        'position': positions[order]
+    }).groupby('cluster').agg(
+        price=('price', 'mean'),
+        touches=('price', 'size'),
+        last_touch=('position', 'max')
+    ).reset_index(drop=True)
+
+
+# Profil de volume par niveau de prix : un seul np.histogram pondéré par le volume
+# sur le prix typique de chaque barre
+def volume_profile(high, low, close, volume, bins=50):
+    typical = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3
+    counts, edges = np.histogram(typical, bins=bins, weights=np.asarray(volume, dtype=float))
+    return counts, edges
+
+
+# Niveaux de support et de résistance sur tout l'historique : pivots regroupés,
+# pondérés par le nombre de contacts et le volume échangé autour du niveau
+def support_resistance(high, low, close, volume, order=5, tolerance=0.01, bins=50):
+    close = np.asarray(close, dtype=float)
+    pivot_highs, pivot_lows = find_pivots(high, low, order)
+    prices = np.concatenate([np.asarray(high, dtype=float)[pivot_highs], np.asarray(low, dtype=float)[pivot_lows]])
+    positions = np.concatenate([pivot_highs, pivot_lows])
+    levels = cluster_levels(prices, positions, tolerance)
+
+    profile, edges = volume_profile(high, low, close, volume, bins)
+    if levels.empty:
+        levels['volume'] = []
+        levels['strength'] = []
+        levels['type'] = []
+        return levels, profile, edges
+
+    level_bins = np.clip(np.searchsorted(edges, levels['price'].values, side='right') - 1, 0, len(profile) - 1)
+    levels['volume'] = profile[level_bins]
+    touches = levels['touches'] / levels['touches'].max()
+    volume_share = levels['volume'] / profile.max() if profile.max() > 0 else 0.0
+    levels['strength'] = (touches + volume_share) / 2
+    levels['type'] = np.where(levels['price'] > close[-1], 'resistance', 'support')
+    return levels, profile, edges
@@ -0,0 +1,302 @@
+import asyncio
+import copy
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from safran import DEFAULT_TICKER
+from safran.ema import MACD, WilderRSI
+
+BAR_COLUMNS = ['date', 'ouv', 'haut', 'bas', 'clot', 'vol']
+INDICATOR_COLUMNS = ['MA_20', 'MA_50', 'BB_Upper', 'BB_Lower', 'RSI', 'RSI_Wilder', 'MACD', 'MACD_Signal', 'MACD_Hist', 'Volume_MA']
+EPOCH = datetime(1970, 1, 1)
+
+
+# Tick au format texte tabulé : horodatage ISO, prix, volume
+def parse_tick(line):
+    fields = line.strip().split("\t")
+    if len(fields) < 3:
+        raise ValueError(f"Tick invalide : {line!r}")
+    return datetime.fromisoformat(fields[0]), float(fields[1]), float(fields[2])
+
+
+def format_tick(timestamp, price, volume):
+    return f"{timestamp.isoformat()}\t{price}\t{volume:g}\n"
+
+
+# Agrégation des ticks dans la barre courante (intervalle en secondes, 1 jour par défaut)
+class BarAggregator:
+    def __init__(self, interval=86400):
+        self.interval = interval
+        self.current = None
+        self.last_timestamp = None
+
+    def _bar_start(self, timestamp):
+        seconds = (timestamp - EPOCH).total_seconds()
+        return EPOCH + timedelta(seconds=seconds - seconds % self.interval)
+
+    # Tick déjà reçu : la source rejoue le flux depuis le début après une reconnexion
+    def seen(self, timestamp):
+        return self.last_timestamp is not None and timestamp <= self.last_timestamp
+
+    # Ajoute un tick ; renvoie la barre clôturée si le tick ouvre une nouvelle barre.
+    # Les ticks déjà reçus (horodatage non postérieur au dernier tick) sont ignorés.
+    def add(self, timestamp, price, volume):
+        if self.seen(timestamp):
+            return None
+        self.last_timestamp = timestamp
+        start = self._bar_start(timestamp)
+        closed = None
+        if self.current is not None and start > self.current['date']:
+            closed = self.current
+            self.current = None
+        if self.current is None:
+            self.current = {'date': start, 'ouv': price, 'haut': price, 'bas': price, 'clot': price, 'vol': volume}
+        else:
+            bar = self.current
+            bar['haut'] = max(bar['haut'], price)
+            bar['bas'] = min(bar['bas'], price)
+            bar['clot'] = price
+            bar['vol'] += volume
+        return closed
+
+
+# Fenêtre glissante à somme et somme des carrés tenues à jour en O(1)
+class _RollingWindow:
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, x):
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+    def full(self):
+        return len(self.values) == self.values.maxlen
+
+    def mean(self):
+        return self.total / len(self.values) if self.full() else np.nan
+
+    def std(self):
+        n = len(self.values)
+        if not self.full() or n < 2:
+            return np.nan
+        return float(np.sqrt(max((self.total_sq - self.total ** 2 / n) / (n - 1), 0.0)))
+
+
+# Indicateurs de load_data() mis à jour barre par barre (O(1) par barre). preview()
+# évalue la barre en formation sur une copie de l'état, sans le modifier.
+class LiveIndicators:
+    def __init__(self):
+        self.ma_20 = _RollingWindow(20)
+        self.ma_50 = _RollingWindow(50)
+        self.gains = _RollingWindow(14)
+        self.losses = _RollingWindow(14)
+        self.rsi_wilder = WilderRSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.volume_ma = _RollingWindow(20)
+        self.last_close = np.nan
+        self.values = {}
+
+    @classmethod
+    def from_history(cls, closes, volumes=()):
+        indicators = cls()
+        closes = np.asarray(closes, dtype=float)
+        for v in np.asarray(volumes, dtype=float)[-20:]:
+            indicators.volume_ma.push(v)
+        # Amorçage vectorisé des filtres exponentiels, fenêtres remplies avec l'historique récent
+        indicators.rsi_wilder.run(closes)
+        indicators.macd.run(closes)
+        for x in closes[-50:]:
+            indicators.ma_50.push(x)
+        for x in closes[-20:]:
+            indicators.ma_20.push(x)
+        deltas = np.diff(closes[-15:])
+        for d in deltas:
+            indicators.gains.push(max(d, 0.0))
+            indicators.losses.push(max(-d, 0.0))
+        if len(closes):
+            indicators.last_close = closes[-1]
+        return indicators
+
+    def update(self, close, volume=np.nan):
+        if not np.isnan(volume):
+            self.volume_ma.push(volume)
+        if not np.isnan(self.last_close):
+            delta = close - self.last_close
+            self.gains.push(max(delta, 0.0))
+            self.losses.push(max(-delta, 0.0))
+        self.last_close = close
+        self.ma_20.push(close)
+        self.ma_50.push(close)
+        rsi_wilder = self.rsi_wilder.update(close)
+        macd = self.macd.update(close)
+
+        loss = self.losses.mean()
+        rsi = 100 - 100 / (1 + self.gains.mean() / loss) if loss else (100.0 if self.gains.full() else np.nan)
+        std = self.ma_20.std()
+        self.values = {
+            'MA_20': self.ma_20.mean(),
+            'MA_50': self.ma_50.mean(),
+            'BB_Upper': self.ma_20.mean() + 2 * std,
+            'BB_Lower': self.ma_20.mean() - 2 * std,
+            'RSI': rsi,
+            'RSI_Wilder': rsi_wilder,
+            **macd,
+            'Volume_MA': self.volume_ma.mean()
+        }
+        return self.values
+
+    def preview(self, close, volume=np.nan):
+        return copy.deepcopy(self).update(close, volume)
+
+
+# Flux temps réel : un consommateur asyncio lit les ticks (socket TCP « tcp://hôte:port »
+# ou fichier suivi en continu), les agrège en barres et met à jour les indicateurs.
+# La boucle tourne dans un thread dédié ; l'interface lit des instantanés via snapshot().
+# Un moteur d'alertes optionnel évalue ses règles à chaque barre clôturée.
+class LiveFeed:
+    def __init__(self, source, history=None, interval=86400, max_bars=500, alerts=None, ticker=DEFAULT_TICKER):
+        self.source = source
+        self.history = history
+        self.alerts = alerts
+        self.ticker = ticker
+        self.aggregator = BarAggregator(interval)
+        self.indicators = None
+        self.bars = deque(maxlen=max_bars)
+        self.ticks = 0
+        self.last_tick = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="safran-live-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._consume())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _consume(self):
+        while True:
+            try:
+                async for line in self._lines():
+                    if line.strip():
+                        self._on_tick(*parse_tick(line))
+                self.error = None
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+            # Toute autre erreur (tick mal formé...) est signalée à l'interface au lieu
+            # d'arrêter silencieusement le consommateur
+            except Exception as e:
+                self.error = f"{type(e).__name__} : {e}"
+            # Reconnexion (ou attente de nouvelles lignes) après une coupure
+            await asyncio.sleep(1.0)
+
+    async def _lines(self):
+        if self.source.startswith("tcp://"):
+            host, port = self.source[len("tcp://"):].rsplit(":", 1)
+            reader, writer = await asyncio.open_connection(host, int(port))
+            try:
+                # Une ligne sans fin de ligne (connexion coupée en cours d'écriture) est ignorée
+                while (line := await reader.readline()).endswith(b"\n"):
+                    yield line.decode()
+            finally:
+                writer.close()
+        else:
+            # Fichier suivi : une ligne n'est transmise qu'une fois complète, l'écrivain
+            # pouvant être en train de l'écrire lors de la lecture
+            with open(self.source) as f:
+                pending = ""
+                while True:
+                    pending += f.readline()
+                    if pending.endswith("\n"):
+                        yield pending
+                        pending = ""
+                    else:
+                        await asyncio.sleep(0.1)
+
+    # Initialisation paresseuse : l'historique antérieur à la première barre reçue
+    # sert à amorcer les indicateurs, ce qui permet aussi de rejouer des données connues
+    def _seed(self, bar_start):
+        history = self.history
+        if history is not None and len(history):
+            history = history[history['date'] < bar_start]
+            columns = BAR_COLUMNS + [c for c in INDICATOR_COLUMNS if c in history.columns]
+            self.bars.extend(history[columns].tail(self.bars.maxlen).to_dict('records'))
+            closes = history['clot'].values
+            volumes = history['vol'].values
+        else:
+            closes = volumes = np.empty(0)
+        self.indicators = LiveIndicators.from_history(closes, volumes)
+        # Dernière barre connue : référence des croisements pour la première barre en direct
+        if self.alerts is not None and self.bars:
+            last = dict(self.bars[-1], Volume_MA=self.indicators.volume_ma.mean())
+            self.alerts.update(pd.DataFrame([last], index=[self.ticker]), notify=False)
+
+    def _on_tick(self, timestamp, price, volume):
+        with self._lock:
+            if self.aggregator.seen(timestamp):
+                return
+            closed = self.aggregator.add(timestamp, price, volume)
+            if self.indicators is None:
+                self._seed(self.aggregator.current['date'])
+            if closed is not None:
+                closed.update(self.indicators.update(closed['clot'], closed['vol']))
+                self.bars.append(closed)
+                if self.alerts is not None:
+                    self.alerts.update(pd.DataFrame([closed], index=[self.ticker]), timestamp=closed['date'])
+            self.ticks += 1
+            self.last_tick = timestamp
+
+    def set_alert_rules(self, rules):
+        with self._lock:
+            self.alerts.set_rules(rules)
+
+    def recent_alerts(self):
+        with self._lock:
+            return list(self.alerts.recent) if self.alerts is not None else []
+
+    # Instantané cohérent de l'état courant (barres clôturées + barre en formation)
+    def snapshot(self):
+        with self._lock:
+            current = dict(self.aggregator.current) if self.aggregator.current else None
+            if current is not None and self.indicators is not None:
+                current.update(self.indicators.preview(current['clot'], current['vol']))
+            return {
+                'bars': pd.DataFrame(list(self.bars)),
+                'current': current,
+                'ticks': self.ticks,
+                'last_tick': self.last_tick,
+                'error': self.error
+            }
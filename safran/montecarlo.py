@@ -0,0 +1,156 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('gbm', 'bootstrap', 'block')
+
+
+# Résultat agrégé d'une simulation : les trajectoires ne sont jamais conservées en
+# entier, seulement un histogramme du log-prix par pas de temps (mémoire bornée,
+# agrégation par simple somme entre blocs et entre processus).
+@dataclass
+class SimulationResult:
+    s0: float
+    horizon: int
+    n_paths: int
+    edges: np.ndarray
+    counts: np.ndarray
+    thresholds: dict = field(default_factory=dict)
+    sample_paths: np.ndarray = None
+
+    # Percentiles du prix par pas de temps, interpolés dans l'histogramme
+    def percentiles(self, qs=(5, 25, 50, 75, 95)):
+        cum = np.cumsum(self.counts, axis=1)
+        out = {}
+        for q in qs:
+            target = q / 100 * self.n_paths
+            bins = np.minimum((cum < target).sum(axis=1), self.counts.shape[1] - 1)
+            rows = np.arange(self.horizon)
+            before = np.where(bins > 0, cum[rows, np.maximum(bins - 1, 0)], 0)
+            inside = self.counts[rows, bins]
+            frac = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.5)
+            log_price = self.edges[bins] + np.clip(frac, 0, 1) * (self.edges[bins + 1] - self.edges[bins])
+            out[q] = np.exp(log_price)
+        return pd.DataFrame(out, index=pd.RangeIndex(1, self.horizon + 1, name='step'))
+
+    # Distribution du prix à l'horizon (centres de classes, probabilités)
+    def terminal_distribution(self):
+        centers = np.exp((self.edges[:-1] + self.edges[1:]) / 2)
+        return centers, self.counts[-1] / self.n_paths
+
+    # Probabilité de finir au-dessus du seuil
+    def prob_above(self, threshold):
+        return self.thresholds[threshold][0] / self.n_paths
+
+    # Probabilité de toucher le seuil au moins une fois avant l'horizon
+    def prob_touch(self, threshold):
+        return self.thresholds[threshold][1] / self.n_paths
+
+
+def _log_increments(rng, log_returns, method, n, horizon, block_size):
+    if method == 'gbm':
+        return rng.normal(log_returns.mean(), log_returns.std(ddof=1), (n, horizon))
+    if method == 'bootstrap':
+        return log_returns[rng.integers(0, len(log_returns), (n, horizon))]
+    # Bootstrap par blocs (circulaire) pour conserver l'autocorrélation de court terme
+    n_blocks = math.ceil(horizon / block_size)
+    starts = rng.integers(0, len(log_returns), (n, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % len(log_returns)
+    return log_returns[idx.reshape(n, n_blocks * block_size)[:, :horizon]]
+
+
+# Simulation d'un bloc de trajectoires ; fonction de module pour pouvoir être
+# exécutée dans un pool de processus
+def _simulate_chunk(log_returns, method, block_size, log_s0, horizon, n, seed, edges, log_thresholds, n_samples):
+    rng = np.random.default_rng(seed)
+    paths = log_s0 + np.cumsum(_log_increments(rng, log_returns, method, n, horizon, block_size), axis=1)
+
+    n_bins = len(edges) - 1
+    width = (edges[-1] - edges[0]) / n_bins
+    bins = np.clip(((paths - edges[0]) / width).astype(np.int64), 0, n_bins - 1)
+    flat = bins + np.arange(horizon) * n_bins
+    counts = np.bincount(flat.ravel(), minlength=horizon * n_bins).reshape(horizon, n_bins)
+
+    hits = {}
+    if len(log_thresholds):
+        path_max = paths.max(axis=1)
+        path_min = paths.min(axis=1)
+        for key, level in log_thresholds.items():
+            above = int((paths[:, -1] >= level).sum())
+            touch = path_max >= level if level >= log_s0 else path_min <= level
+            hits[key] = np.array([above, int(touch.sum())])
+    return counts, hits, np.exp(paths[:n_samples])
+
+
+# Lot de blocs traité par un même processus : les histogrammes sont sommés au fil
+# de l'eau pour que la mémoire reste bornée quel que soit le nombre de trajectoires
+def _simulate_chunks(jobs):
+    counts, hits, samples = None, {}, None
+    for job in jobs:
+        chunk_counts, chunk_hits, chunk_samples = _simulate_chunk(*job)
+        counts = chunk_counts if counts is None else counts + chunk_counts
+        for key, value in chunk_hits.items():
+            hits[key] = hits.get(key, 0) + value
+        if samples is None:
+            samples = chunk_samples
+    return counts, hits, samples
+
+
+# Simulation Monte-Carlo de trajectoires futures à partir des rendements historiques
+# (en pourcentage, comme Daily_Return). Les trajectoires sont générées par blocs de
+# taille fixe, chacun avec sa propre graine dérivée de 'seed' : le résultat ne dépend
+# ni de n_jobs ni de l'ordre d'exécution des blocs.
+def simulate_paths(returns, s0, horizon, n_paths, method='gbm', block_size=10,
+                   chunk_size=10_000, seed=None, n_jobs=1, thresholds=(),
+                   n_bins=1000, n_samples=50):
+    if method not in METHODS:
+        raise ValueError(f"Méthode de simulation inconnue : {method}")
+    returns = np.asarray(returns, dtype=float)
+    log_returns = np.log1p(returns[~np.isnan(returns)] / 100)
+    if len(log_returns) < 2:
+        raise ValueError("Pas assez de rendements pour simuler des trajectoires")
+
+    # Grille de log-prix centrée sur le cours actuel, assez large pour les queues
+    spread = abs(log_returns.mean()) * horizon + 8 * log_returns.std(ddof=1) * math.sqrt(horizon)
+    log_s0 = math.log(s0)
+    edges = np.linspace(log_s0 - spread, log_s0 + spread, n_bins + 1)
+    log_thresholds = {t: math.log(t) for t in thresholds}
+
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [
+        (log_returns, method, block_size, log_s0, horizon, size, chunk_seed, edges, log_thresholds,
+         n_samples if i == 0 else 0)
+        for i, (size, chunk_seed) in enumerate(zip(sizes, seeds))
+    ]
+
+    # Répartition des blocs en lots, un par processus
+    n_jobs = max(1, min(n_jobs, len(jobs)))
+    groups = [jobs[i::n_jobs] for i in range(n_jobs)]
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_simulate_chunks, groups))
+    else:
+        results = [_simulate_chunks(groups[0])]
+
+    counts = np.zeros((horizon, n_bins), dtype=np.int64)
+    hits = {t: np.zeros(2, dtype=np.int64) for t in thresholds}
+    for group_counts, group_hits, _ in results:
+        counts += group_counts
+        for t, h in group_hits.items():
+            hits[t] += h
+
+    return SimulationResult(
+        s0=s0,
+        horizon=horizon,
+        n_paths=n_paths,
+        edges=edges,
+        counts=counts,
+        thresholds={t: tuple(int(v) for v in h) for t, h in hits.items()},
+        sample_paths=results[0][2]
+    )
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from safran.ema import _smooth
+from safran.levels import trailing_max, trailing_min
+
+
+# Sommes sur les 'window' dernières barres à partir d'une somme cumulée préfixée de 0
+def _trailing_sums(csum, window):
+    out = np.full(len(csum) - 1, np.nan)
+    if window <= len(out):
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+# Indicateurs de volume et d'amplitude calculés en une seule passe vectorisée sur les
+# tableaux OHLCV : VWAP ancré et glissant, On-Balance Volume, ATR (lissage de Wilder)
+# et oscillateur stochastique. Les sommes cumulées (prix x volume, volume) et les
+# extrema glissants sont calculés une fois et partagés entre les indicateurs.
+def volume_range_indicators(high, low, close, volume, vwap_window=20, atr_period=14,
+                            stoch_period=14, stoch_smooth=3, anchor=0):
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    n = len(close)
+
+    # Sommes cumulées partagées
+    typical = (high + low + close) / 3
+    cum_pv = np.concatenate(([0.0], np.cumsum(typical * volume)))
+    cum_vol = np.concatenate(([0.0], np.cumsum(volume)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # VWAP ancré sur la barre 'anchor'
+        vwap = np.full(n, np.nan)
+        vwap[anchor:] = (cum_pv[anchor + 1:] - cum_pv[anchor]) / (cum_vol[anchor + 1:] - cum_vol[anchor])
+        # VWAP glissant sur les mêmes sommes cumulées
+        vwap_rolling = _trailing_sums(cum_pv, vwap_window) / _trailing_sums(cum_vol, vwap_window)
+
+    # On-Balance Volume
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    direction = np.sign(np.nan_to_num(close - previous_close))
+    obv = np.cumsum(direction * volume)
+
+    # True Range et ATR de Wilder (moyenne simple sur la première période)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = np.full(n, np.nan)
+    if n >= atr_period:
+        seed = true_range[:atr_period].mean()
+        atr[atr_period - 1] = seed
+        atr[atr_period:] = _smooth(true_range[atr_period:], 1.0 / atr_period, seed)
+
+    # Oscillateur stochastique sur les extrema glissants
+    highest = trailing_max(high, stoch_period) if n >= stoch_period else np.full(n, np.nan)
+    lowest = trailing_min(low, stoch_period) if n >= stoch_period else np.full(n, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = np.where(highest > lowest, 100 * (close - lowest) / (highest - lowest), 50.0)
+    stoch_k[np.isnan(highest)] = np.nan
+    cum_k = np.concatenate(([0.0], np.cumsum(np.nan_to_num(stoch_k))))
+    stoch_d = _trailing_sums(cum_k, stoch_smooth) / stoch_smooth
+    stoch_d[:stoch_period + stoch_smooth - 2] = np.nan
+
+    return pd.DataFrame({
+        'VWAP': vwap,
+        'VWAP_Rolling': vwap_rolling,
+        'OBV': obv,
+        'ATR': atr,
+        'Stoch_K': stoch_k,
+        'Stoch_D': stoch_d
+    })
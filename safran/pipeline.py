@@ -0,0 +1,76 @@
+import pandas as pd
+
+from safran.ema import MACD, WilderRSI
+from safran.ohlcv import volume_range_indicators
+
+DATA_FILE = "SAFRAN_data_bourse.txt"
+
+
+# Lecture d'un fichier de cotations au format tabulé (date, ouv, haut, bas, clot, vol, devise)
+def read_bourse_file(path=DATA_FILE):
+    df = pd.read_csv(path, sep="\t")
+    df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y %H:%M')
+    return df.sort_values('date')
+
+
+# Calcul des indicateurs techniques sur les cotations
+def compute_indicators(df):
+    df['MA_20'] = df['clot'].rolling(window=20).mean()
+    df['MA_50'] = df['clot'].rolling(window=50).mean()
+    df['Volatility'] = df['clot'].rolling(window=20).std()
+    df['Daily_Return'] = df['clot'].pct_change() * 100
+
+    # Bandes de Bollinger
+    df['BB_Middle'] = df['clot'].rolling(window=20).mean()
+    df['BB_Upper'] = df['BB_Middle'] + 2 * df['clot'].rolling(window=20).std()
+    df['BB_Lower'] = df['BB_Middle'] - 2 * df['clot'].rolling(window=20).std()
+
+    # RSI (Relative Strength Index)
+    delta = df['clot'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    df['RSI'] = 100 - (100 / (1 + rs))
+
+    # Indicateurs exponentiels (filtres récursifs)
+    df['RSI_Wilder'] = WilderRSI(14).run(df['clot'])
+    macd = MACD(12, 26, 9).run(df['clot'])
+    df['MACD'] = macd['MACD'].values
+    df['MACD_Signal'] = macd['MACD_Signal'].values
+    df['MACD_Hist'] = macd['MACD_Hist'].values
+
+    # Indicateurs de volume et d'amplitude (passe unique sur les tableaux OHLCV)
+    volume_pack = volume_range_indicators(df['haut'], df['bas'], df['clot'], df['vol'])
+    for column in volume_pack.columns:
+        df[column] = volume_pack[column].values
+
+    return df
+
+
+def load_dataset(path=DATA_FILE):
+    return compute_indicators(read_bourse_file(path))
+
+
+# Colonnes dérivées propres à certaines sections du tableau de bord, calculées à part
+# pour ne jamais modifier le jeu de données partagé
+def derived_columns(df):
+    return pd.DataFrame({
+        'Cumulative_Return': (1 + df['Daily_Return'] / 100).cumprod() - 1,
+        'Volume_MA': df['vol'].rolling(window=20).mean()
+    }, index=df.index)
+
+
+# Résumé trimestriel (prix, volume, volatilité, performance) en une seule agrégation
+def quarterly_summary(df):
+    stats = df.groupby(df['date'].dt.to_period('Q')).agg(
+        Prix_Début=('clot', 'first'),
+        Prix_Fin=('clot', 'last'),
+        Plus_Bas=('clot', 'min'),
+        Plus_Haut=('clot', 'max'),
+        Prix_Moyen=('clot', 'mean'),
+        Volume_Total=('vol', 'sum'),
+        Volatilité=('Daily_Return', 'std')
+    ).reset_index(names='Trimestre')
+    stats['Performance_%'] = (stats['Prix_Fin'] - stats['Prix_Début']) / stats['Prix_Début'] * 100
+    stats['Trimestre'] = stats['Trimestre'].astype(str)
+    return stats
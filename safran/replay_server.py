@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+from datetime import timedelta
+
+import numpy as np
+
+from safran.live import format_tick
+from safran.pipeline import DATA_FILE, read_bourse_file
+
+# Séance de cotation rejouée : de 9h00 à 17h30
+SESSION_OPEN = timedelta(hours=9)
+SESSION_LENGTH = timedelta(hours=8, minutes=30)
+
+
+# Ticks synthétiques reconstituant une barre OHLCV : ouverture, plus haut et plus bas
+# (dans l'ordre suggéré par le sens de la séance), puis marche vers la clôture
+def bar_ticks(bar, ticks_per_bar, rng):
+    ticks_per_bar = max(ticks_per_bar, 4)
+    if bar['clot'] >= bar['ouv']:
+        anchors = [bar['ouv'], bar['bas'], bar['haut'], bar['clot']]
+    else:
+        anchors = [bar['ouv'], bar['haut'], bar['bas'], bar['clot']]
+    positions = np.linspace(0, 3, ticks_per_bar)
+    prices = np.interp(positions, [0, 1, 2, 3], anchors)
+    # Léger bruit borné par le plus haut / plus bas de la barre
+    noise = rng.normal(0, (bar['haut'] - bar['bas']) * 0.05, ticks_per_bar)
+    noise[[0, -1]] = 0
+    prices = np.clip(np.round(prices + noise, 2), bar['bas'], bar['haut'])
+    volumes = rng.multinomial(int(bar['vol']), np.full(ticks_per_bar, 1 / ticks_per_bar))
+    offsets = np.linspace(0, SESSION_LENGTH.total_seconds(), ticks_per_bar)
+    session_start = bar['date'].normalize() + SESSION_OPEN
+    for offset, price, volume in zip(offsets, prices, volumes):
+        yield (session_start + timedelta(seconds=float(offset))).to_pydatetime(), float(price), int(volume)
+
+
+# Serveur de rejeu : chaque client connecté reçoit les ticks du fichier de cotations,
+# à partir de la date 'start', au rythme d'un tick toutes les 'delay' secondes
+async def serve(path, host, port, start=None, ticks_per_bar=20, delay=0.05, seed=0):
+    df = read_bourse_file(path)
+    if start is not None:
+        df = df[df['date'] >= start]
+    bars = df.to_dict('records')
+
+    async def handle(reader, writer):
+        rng = np.random.default_rng(seed)
+        try:
+            for bar in bars:
+                for tick in bar_ticks(bar, ticks_per_bar, rng):
+                    writer.write(format_tick(*tick).encode())
+                    await writer.drain()
+                    await asyncio.sleep(delay)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Rejeu de {len(bars)} barres sur tcp://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de rejeu de ticks pour le mode temps réel")
+    parser.add_argument("--file", default=DATA_FILE)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--start", default=None, help="Date de début du rejeu (AAAA-MM-JJ)")
+    parser.add_argument("--ticks-per-bar", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.05, help="Secondes entre deux ticks")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.file, args.host, args.port, args.start, args.ticks_per_bar, args.delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
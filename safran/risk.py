@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.stats import norm
+
+from safran.rolling import _window_sums
+
+# Nombre maximal d'éléments matérialisés par bloc pour les quantiles glissants
+_CHUNK_ELEMENTS = 4_000_000
+
+
+# Moteur de risque vectorisé sur une série de rendements (en décimal, ex. 0.01 = 1 %).
+# Les sommes glissantes et les résultats sont mis en cache par fenêtre : chaque
+# indicateur ne demande qu'un passage sur le tableau des rendements.
+class RiskEngine:
+    def __init__(self, returns, periods_per_year=252):
+        self.index = returns.index if isinstance(returns, pd.Series) else None
+        self.returns = np.asarray(returns, dtype=float)
+        self.periods_per_year = periods_per_year
+        self._missing = np.isnan(self.returns)
+        self._clean = np.where(self._missing, 0.0, self.returns)
+        self._sums = {}
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _frame(self, columns):
+        return pd.DataFrame(columns, index=self.index)
+
+    def _pad(self, values, window):
+        out = np.full(len(self.returns), np.nan)
+        if len(values):
+            out[window - 1:] = values
+        return out
+
+    # Sommes glissantes partagées : r, r², min(r, 0)² et nombre de valeurs manquantes
+    def _window_sums(self, window):
+        if window not in self._sums:
+            r = self._clean
+            downside = np.minimum(r, 0.0)
+            self._sums[window] = (
+                _window_sums(r, window),
+                _window_sums(r * r, window),
+                _window_sums(downside * downside, window),
+                _window_sums(self._missing.astype(float), window)
+            )
+        return self._sums[window]
+
+    # Drawdown à partir du maximum courant de la valeur cumulée
+    def drawdown(self):
+        def compute():
+            equity = np.cumprod(1 + self._clean)
+            running_max = np.maximum.accumulate(equity)
+            drawdown = equity / running_max - 1
+            # Durée sous l'eau : nombre de barres depuis le dernier plus haut
+            positions = np.arange(len(equity))
+            last_peak = np.maximum.accumulate(np.where(equity >= running_max, positions, 0))
+            duration = positions - last_peak
+            return self._frame({'equity': equity, 'drawdown': drawdown, 'duration': duration})
+        return self._cached(('drawdown',), compute)
+
+    def max_drawdown(self):
+        drawdown = self.drawdown()['drawdown']
+        return float(drawdown.min()) if len(drawdown) else 0.0
+
+    def max_drawdown_duration(self):
+        duration = self.drawdown()['duration']
+        return int(duration.max()) if len(duration) else 0
+
+    def sharpe(self):
+        valid = self.returns[~self._missing]
+        if len(valid) < 2 or valid.std(ddof=1) == 0:
+            return 0.0
+        return float(valid.mean() / valid.std(ddof=1) * np.sqrt(self.periods_per_year))
+
+    def sortino(self):
+        valid = self.returns[~self._missing]
+        downside = np.sqrt(np.mean(np.minimum(valid, 0.0) ** 2)) if len(valid) else 0.0
+        if downside == 0:
+            return 0.0
+        return float(valid.mean() / downside * np.sqrt(self.periods_per_year))
+
+    def rolling_sharpe(self, window):
+        def compute():
+            if len(self.returns) < window or window < 2:
+                return pd.Series(np.full(len(self.returns), np.nan), index=self.index)
+            s1, s2, _, missing = self._window_sums(window)
+            mean = s1 / window
+            var = np.maximum((s2 - window * mean ** 2) / (window - 1), 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe = np.where(var > 0, mean / np.sqrt(var), np.nan) * np.sqrt(self.periods_per_year)
+            sharpe[missing > 0] = np.nan
+            return pd.Series(self._pad(sharpe, window), index=self.index)
+        return self._cached(('sharpe', window), compute)
+
+    def rolling_sortino(self, window):
+        def compute():
+            if len(self.returns) < window or window < 2:
+                return pd.Series(np.full(len(self.returns), np.nan), index=self.index)
+            s1, _, s_down, missing = self._window_sums(window)
+            downside = np.sqrt(s_down / window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sortino = np.where(downside > 0, s1 / window / downside, np.nan) * np.sqrt(self.periods_per_year)
+            sortino[missing > 0] = np.nan
+            return pd.Series(self._pad(sortino, window), index=self.index)
+        return self._cached(('sortino', window), compute)
+
+    # VaR et CVaR glissantes, exprimées en pertes positives.
+    # 'historical' : quantile empirique par np.partition sur des blocs de fenêtres ;
+    # 'parametric' : loi normale ajustée sur la moyenne et l'écart-type glissants.
+    def rolling_var(self, window, level=0.95, method='historical'):
+        def compute():
+            n = len(self.returns)
+            if n < window or window < 2:
+                nan = np.full(n, np.nan)
+                return self._frame({'VaR': nan, 'CVaR': nan.copy()})
+            if method == 'historical':
+                var, cvar = self._historical_var(window, level)
+            elif method == 'parametric':
+                var, cvar = self._parametric_var(window, level)
+            else:
+                raise ValueError(f"Méthode de VaR inconnue : {method}")
+            missing = self._window_sums(window)[3] > 0
+            var[missing] = np.nan
+            cvar[missing] = np.nan
+            return self._frame({'VaR': self._pad(var, window), 'CVaR': self._pad(cvar, window)})
+        return self._cached(('var', window, level, method), compute)
+
+    def _historical_var(self, window, level):
+        k = max(1, int(np.ceil((1 - level) * window - 1e-9)))
+        windows = sliding_window_view(self._clean, window)
+        var = np.empty(len(windows))
+        cvar = np.empty(len(windows))
+        step = max(1, _CHUNK_ELEMENTS // window)
+        for start in range(0, len(windows), step):
+            block = np.partition(windows[start:start + step], k - 1, axis=1)
+            var[start:start + step] = -block[:, k - 1]
+            cvar[start:start + step] = -block[:, :k].mean(axis=1)
+        return var, cvar
+
+    def _parametric_var(self, window, level):
+        s1, s2, _, _ = self._window_sums(window)
+        mean = s1 / window
+        std = np.sqrt(np.maximum((s2 - window * mean ** 2) / (window - 1), 0.0))
+        z = norm.ppf(1 - level)
+        var = -(mean + z * std)
+        cvar = -(mean - std * norm.pdf(z) / (1 - level))
+        return var, cvar
+
+    # VaR et CVaR sur tout l'échantillon
+    def var(self, level=0.95, method='historical'):
+        valid = self.returns[~self._missing]
+        if len(valid) < 2:
+            return np.nan, np.nan
+        tail = RiskEngine(valid, self.periods_per_year).rolling_var(len(valid), level, method)
+        return tuple(tail.iloc[-1])
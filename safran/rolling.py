@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+# Sommes glissantes sur une fenêtre de taille fixe à partir d'une somme cumulée
+# (coût O(n) quelle que soit la taille de la fenêtre)
+def _window_sums(values, window):
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    return csum[window:] - csum[:-window]
+
+
+# Sommes glissantes locales pour la régression : les fenêtres commençant dans le bloc b
+# (lignes b*w..(b+1)*w-1) sont toutes contenues dans le segment b*w..(b+2)*w-1. Chaque
+# segment est décalé de sa propre valeur de référence et cumulé séparément, avec x local
+# 0..2w-1 : les erreurs d'arrondi dépendent de la taille de la fenêtre, pas de la
+# longueur de la série. Renvoie la référence, Σy, Σy², Σxy (x = 0..w-1 dans la fenêtre)
+# et le nombre de valeurs manquantes, pour chacune des n - w + 1 fenêtres.
+def _local_regression_sums(y, window):
+    n_windows = len(y) - window + 1
+    blocks = -(-n_windows // window)
+    padded = np.full((blocks + 1) * window, np.nan)
+    padded[:len(y)] = y
+    segments = np.lib.stride_tricks.sliding_window_view(padded, 2 * window)[::window]
+
+    missing = np.isnan(segments)
+    reference = segments[:, 0].copy()
+    unset = np.isnan(reference)
+    if unset.any():
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fallback = np.nansum(segments[unset], axis=1) / (~missing[unset]).sum(axis=1)
+        reference[unset] = np.nan_to_num(fallback)
+    z = np.where(missing, 0.0, segments - reference[:, None])
+    x = np.arange(2 * window, dtype=float)
+
+    def window_sums(values):
+        csum = np.zeros((blocks, 2 * window + 1))
+        np.cumsum(values, axis=1, out=csum[:, 1:])
+        return csum[:, window:2 * window] - csum[:, :window]
+
+    s_y = window_sums(z)
+    s_yy = window_sums(z * z)
+    # Σ (x_segment - k) z sur la fenêtre commençant à la position k du bloc
+    s_xy = window_sums(x * z) - np.arange(window) * s_y
+    n_missing = window_sums(missing.astype(float))
+    reference = np.repeat(reference, window)
+    return tuple(a.ravel()[:n_windows] for a in (reference, s_y, s_yy, s_xy, n_missing))
+
+
+# Régression linéaire glissante (pente, ordonnée à l'origine, R², erreur type)
+# calculée en forme fermée à partir de sommes glissantes locales.
+# Sur chaque fenêtre, x vaut 0..window-1 comme dans stats.linregress(np.arange(window), y) ;
+# 'trend' est la valeur ajustée sur la dernière barre de la fenêtre.
+def rolling_linregress(values, window):
+    index = values.index if isinstance(values, pd.Series) else None
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    columns = ['slope', 'intercept', 'r2', 'stderr', 'trend']
+    out = np.full((n, len(columns)), np.nan)
+
+    if window < 3 or n < window:
+        return pd.DataFrame(out, index=index, columns=columns)
+
+    reference, s_y, s_yy, s_xy, n_missing = _local_regression_sums(y, window)
+    w = float(window)
+
+    # Les sommes sur x ne dépendent que de la taille de la fenêtre
+    s_x = w * (w - 1) / 2
+    s_xx = (w - 1) * w * (2 * w - 1) / 6
+
+    ss_x = w * s_xx - s_x ** 2
+    ss_xy = w * s_xy - s_x * s_y
+    ss_y = np.maximum(w * s_yy - s_y ** 2, 0.0)
+
+    slope = ss_xy / ss_x
+    intercept = (s_y - slope * s_x) / w + reference
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_y > 0, ss_xy ** 2 / (ss_x * ss_y), 0.0)
+    r2 = np.clip(r2, 0.0, 1.0)
+    # Même définition que stats.linregress : sqrt((1 - r²) * var(y) / var(x) / (n - 2))
+    stderr = np.sqrt((1 - r2) * ss_y / ss_x / (w - 2))
+    trend = intercept + slope * (w - 1)
+
+    result = np.column_stack([slope, intercept, r2, stderr, trend])
+    result[n_missing > 0] = np.nan
+    out[window - 1:] = result
+    return pd.DataFrame(out, index=index, columns=columns)
+
+
+# Moments glissants d'ordre 3 et 4 et tests de normalité, à partir des sommes glissantes
+# des puissances 1 à 4 (un seul passage vectorisé, aucun appel scipy par fenêtre).
+# skew et kurtosis (excès) sont les estimateurs biaisés de stats.skew / stats.kurtosis,
+# jarque_bera et jb_pvalue ceux de stats.jarque_bera. t_df et t_scale ajustent une loi de
+# Student par la méthode des moments (excès de kurtosis = 6 / (ν - 4)), ν infini si la
+# fenêtre n'a pas de queues plus épaisses que la loi normale.
+def rolling_moments(values, window):
+    index = values.index if isinstance(values, pd.Series) else None
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    columns = ['mean', 'std', 'skew', 'kurtosis', 'jarque_bera', 'jb_pvalue', 't_df', 't_scale']
+    out = np.full((n, len(columns)), np.nan)
+
+    if window < 4 or n < window:
+        return pd.DataFrame(out, index=index, columns=columns)
+
+    # Série centrée réduite sur tout l'historique : les sommes de puissances restent
+    # d'ordre de grandeur comparable et les moments d'ordre 3 et 4 n'en dépendent pas
+    missing = np.isnan(y)
+    offset = np.nanmean(y) if not missing.all() else 0.0
+    scale = np.nanstd(y) if not missing.all() else 1.0
+    scale = scale if scale > 0 else 1.0
+    z = np.where(missing, 0.0, (y - offset) / scale)
+
+    w = float(window)
+    z2 = z * z
+    mu = _window_sums(z, window) / w
+    p2 = _window_sums(z2, window) / w
+    p3 = _window_sums(z2 * z, window) / w
+    p4 = _window_sums(z2 * z2, window) / w
+    n_missing = _window_sums(missing.astype(float), window)
+
+    # Moments centrés de la fenêtre
+    m2 = np.maximum(p2 - mu ** 2, 0.0)
+    m3 = p3 - 3 * mu * p2 + 2 * mu ** 3
+    m4 = np.maximum(p4 - 4 * mu * p3 + 6 * mu ** 2 * p2 - 3 * mu ** 4, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skew = np.where(m2 > 0, m3 / m2 ** 1.5, np.nan)
+        kurtosis = np.where(m2 > 0, m4 / m2 ** 2 - 3, np.nan)
+        jarque_bera = w / 6 * (skew ** 2 + kurtosis ** 2 / 4)
+        # Loi du χ² à 2 degrés de liberté : P(X > x) = exp(-x / 2)
+        jb_pvalue = np.exp(-jarque_bera / 2)
+        t_df = np.where(kurtosis > 0, 4 + 6 / kurtosis, np.inf)
+        std = np.sqrt(m2) * scale
+        t_scale = np.where(np.isfinite(t_df), std * np.sqrt((t_df - 2) / t_df), std)
+
+    result = np.column_stack([mu * scale + offset, std, skew, kurtosis, jarque_bera, jb_pvalue, t_df, t_scale])
+    result[n_missing > 0] = np.nan
+    out[window - 1:] = result
+    return pd.DataFrame(out, index=index, columns=columns)
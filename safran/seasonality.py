@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+DOW_LABELS = ['Lun', 'Mar', 'Mer', 'Jeu', 'Ven', 'Sam', 'Dim']
+MONTH_LABELS = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Juin', 'Juil', 'Août', 'Sep', 'Oct', 'Nov', 'Déc']
+CUBE_COLUMNS = ['ticker', 'period', 'dow', 'hour', 'count', 'total', 'total_sq', 'hits']
+STATISTICS = ['mean', 'hit_rate', 'volatility', 'count']
+
+
+def _period(date):
+    date = pd.Timestamp(date)
+    return date.year * 100 + date.month
+
+
+# Cube calendaire : statistiques suffisantes des rendements (nombre, somme, somme des
+# carrés, hausses) par (ticker, mois AAAAMM, jour de semaine, heure), obtenues en une
+# seule agrégation groupée. Toute vue saisonnière se déduit ensuite du cube par sommes,
+# sans revenir aux barres.
+def calendar_cube(frames):
+    parts = []
+    for ticker, df in frames.items():
+        returns = df['Daily_Return']
+        valid = returns.notna().values
+        dates = df['date'][valid]
+        parts.append(pd.DataFrame({
+            'ticker': ticker,
+            'period': (dates.dt.year * 100 + dates.dt.month).values,
+            'dow': dates.dt.dayofweek.values,
+            'hour': dates.dt.hour.values,
+            'ret': returns.values[valid]
+        }))
+    if not parts:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    raw = pd.concat(parts, ignore_index=True)
+    raw['sq'] = raw['ret'] ** 2
+    raw['hit'] = raw['ret'] > 0
+    return raw.groupby(['ticker', 'period', 'dow', 'hour'], sort=True).agg(
+        count=('ret', 'size'),
+        total=('ret', 'sum'),
+        total_sq=('sq', 'sum'),
+        hits=('hit', 'sum')
+    ).reset_index()
+
+
+# Sélection d'une période (au mois près) et de tickers par simple masque sur le cube
+def slice_cube(cube, start=None, end=None, tickers=None):
+    mask = np.ones(len(cube), dtype=bool)
+    if start is not None:
+        mask &= (cube['period'] >= _period(start)).values
+    if end is not None:
+        mask &= (cube['period'] <= _period(end)).values
+    if tickers is not None:
+        mask &= cube['ticker'].isin(tickers).values
+    return cube[mask]
+
+
+# Rendement moyen, taux de hausse (%) et volatilité (écart-type des rendements) par
+# case calendaire, sur les dimensions 'rows' × 'columns' (dow, month, hour, period, ticker)
+def seasonality(cube, rows='dow', columns='month', start=None, end=None, tickers=None):
+    part = slice_cube(cube, start, end, tickers)
+    part = part.assign(month=part['period'] % 100)
+    sums = part.groupby([rows, columns])[['count', 'total', 'total_sq', 'hits']].sum()
+    count = sums['count'].astype(float)
+    variance = (sums['total_sq'] - sums['total'] ** 2 / count) / (count - 1)
+    return pd.DataFrame({
+        'mean': sums['total'] / count,
+        'hit_rate': sums['hits'] / count * 100,
+        'volatility': np.sqrt(variance.clip(lower=0)).where(count > 1),
+        'count': sums['count']
+    })
+
+
+# Tableau croisé d'une statistique, libellés français pour les jours et les mois
+def seasonality_table(stats, statistic='mean'):
+    table = stats[statistic].unstack()
+    labels = {'dow': DOW_LABELS, 'month': [None] + MONTH_LABELS}
+    for axis, names in ((0, table.index), (1, table.columns)):
+        mapping = labels.get(names.name)
+        if mapping is not None:
+            renamed = [mapping[int(v)] for v in names]
+            table = table.set_axis(renamed, axis=axis)
+    return table
@@ -0,0 +1,355 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from safran import DEFAULT_TICKER
+from safran.indicator_cache import INDICATORS, IndicatorCache
+from safran.pipeline import DATA_FILE, load_dataset
+from safran.risk import RiskEngine
+from safran.shared_store import shared_frame, source_fingerprint
+from safran.storage import store_from_env
+
+# Colonnes de prix et d'indicateurs retournées par défaut par /series
+DEFAULT_FIELDS = ['ouv', 'haut', 'bas', 'clot', 'vol', 'MA_20', 'MA_50', 'RSI']
+
+
+class QueryError(ValueError):
+    status = 400
+
+
+class NotFound(QueryError):
+    status = 404
+
+
+# Sources de cotations par ticker : fichiers au format SAFRAN_data_bourse.txt (jeu de
+# données partagé en mémoire) ou base SQLite. Les empreintes ne sont relues qu'au plus
+# toutes les 'refresh' secondes ; un changement invalide les résultats du ticker.
+class Datasets:
+    def __init__(self, files=None, store=None, refresh=1.0):
+        self.files = files or {}
+        self.store = store
+        self.refresh = refresh
+        self._frames = {}
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def tickers(self):
+        tickers = set(self.files)
+        if self.store is not None:
+            tickers.update(self.store.tickers())
+        return sorted(tickers)
+
+    def _fingerprint(self, ticker):
+        if ticker in self.files:
+            return source_fingerprint(self.files[ticker])
+        if self.store is not None:
+            n, last = self.store.fingerprint(ticker)
+            if n:
+                return f"{n}-{last}"
+        raise NotFound(f"Ticker inconnu : {ticker}")
+
+    def fingerprint(self, ticker):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(ticker)
+            if checked is not None and now - checked[0] < self.refresh:
+                return checked[1]
+        fingerprint = self._fingerprint(ticker)
+        with self._lock:
+            self._checked[ticker] = (now, fingerprint)
+        return fingerprint
+
+    def frame(self, ticker):
+        fingerprint = self.fingerprint(ticker)
+        with self._lock:
+            cached = self._frames.get(ticker)
+            if cached is not None and cached[0] == fingerprint:
+                return fingerprint, cached[1]
+        if ticker in self.files:
+            df = shared_frame(self.files[ticker], load_dataset, fingerprint=fingerprint)
+        else:
+            df = self.store.query_range(ticker, indicators=True)
+        with self._lock:
+            self._frames[ticker] = (fingerprint, df)
+        return fingerprint, df
+
+
+# Cache LRU des réponses sérialisées (corps JSON et ETag) par requête normalisée
+class ResponseCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _json_values(values):
+    values = np.asarray(values, dtype=float)
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def _number(value):
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+# Champ de /series : colonne du jeu de données (« clot », « MACD »...) ou indicateur
+# paramétré « nom:param=valeur,param=valeur » (ex. « bollinger:window=20,width=2.5 »)
+def parse_field(spec):
+    name, _, args = spec.partition(":")
+    params = {}
+    for item in filter(None, args.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise QueryError(f"Paramètre invalide : {item}")
+        try:
+            number = float(value)
+        except ValueError:
+            raise QueryError(f"Valeur invalide pour {key} : {value}")
+        params[key] = int(number) if number.is_integer() and "." not in value else number
+    return name, params
+
+
+class QueryService:
+    def __init__(self, datasets, max_entries=1024):
+        self.datasets = datasets
+        self.indicators = IndicatorCache(max_entries=256)
+        self.responses = ResponseCache(max_entries)
+
+    def _select(self, df, start, end):
+        mask = np.ones(len(df), dtype=bool)
+        if start:
+            mask &= (df['date'] >= pd.Timestamp(start)).values
+        if end:
+            mask &= (df['date'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)).values
+        return mask
+
+    def _field(self, fingerprint, df, spec):
+        name, params = parse_field(spec)
+        if name in INDICATORS:
+            try:
+                value = self.indicators.get(fingerprint, name, df, **params)
+            except (TypeError, ValueError) as e:
+                raise QueryError(f"Paramètres invalides pour {name} : {e}")
+            if isinstance(value, pd.DataFrame):
+                return {f"{spec}.{column}": value[column].values for column in value.columns}
+            if isinstance(value, pd.Series) and len(value) == len(df):
+                return {spec: value.values}
+            raise QueryError(f"{name} n'est pas une série")
+        if params or name not in df.columns or name == 'date':
+            raise QueryError(f"Champ inconnu : {spec}")
+        if not pd.api.types.is_numeric_dtype(df[name]):
+            raise QueryError(f"Champ non numérique : {spec}")
+        return {spec: df[name].values}
+
+    def series(self, fingerprint, df, params):
+        mask = self._select(df, params.get('start'), params.get('end'))
+        columns = {}
+        for spec in params.get('fields') or DEFAULT_FIELDS:
+            columns.update(self._field(fingerprint, df, spec))
+        return {
+            'date': df['date'].values[mask].astype('datetime64[s]').astype(str).tolist(),
+            **{name: _json_values(values[mask]) for name, values in columns.items()}
+        }
+
+    # Indicateurs clés de la période, calculés comme dans les sections du tableau de bord
+    def kpis(self, fingerprint, df, params):
+        period = df[self._select(df, params.get('start'), params.get('end'))]
+        if period.empty:
+            return {'days': 0}
+        close = period['clot']
+        returns = close.pct_change()
+        risk = RiskEngine(returns.values)
+        last = period.iloc[-1]
+        return {
+            'days': len(period),
+            'start': str(period['date'].iloc[0]),
+            'end': str(period['date'].iloc[-1]),
+            'first_close': _number(close.iloc[0]),
+            'last_close': _number(close.iloc[-1]),
+            'variation_pct': _number((close.iloc[-1] - close.iloc[0]) / close.iloc[0] * 100),
+            'high': _number(period['haut'].max()),
+            'low': _number(period['bas'].min()),
+            'mean_close': _number(close.mean()),
+            'std_close': _number(close.std()),
+            'avg_volume': _number(period['vol'].mean()),
+            'total_volume': _number(period['vol'].sum()),
+            'volatility_annual_pct': _number(returns.std() * np.sqrt(252) * 100),
+            'sharpe': _number(risk.sharpe()),
+            'sortino': _number(risk.sortino()),
+            'max_drawdown_pct': _number(risk.max_drawdown() * 100),
+            **{column: _number(last[column]) for column in ['MA_20', 'MA_50', 'RSI', 'RSI_Wilder', 'MACD'] if column in period}
+        }
+
+    # Requête /series ou /kpis pour un ou plusieurs tickers. L'ETag ne dépend que de la
+    # requête normalisée et des empreintes des données : une requête conditionnelle dont
+    # l'ETag est inchangé est servie (304) sans calcul ni lecture du cache.
+    def query(self, endpoint, params, if_none_match=None):
+        if endpoint not in ('series', 'kpis'):
+            raise NotFound(f"Point d'accès inconnu : /{endpoint}")
+        tickers = params.get('tickers') or [DEFAULT_TICKER]
+        fingerprints = {ticker: self.datasets.fingerprint(ticker) for ticker in tickers}
+        key = json.dumps([endpoint, params, fingerprints], sort_keys=True)
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return etag, None
+
+        cached = self.responses.get(key)
+        if cached is not None:
+            return cached
+        compute = self.series if endpoint == 'series' else self.kpis
+        results = {}
+        for ticker in tickers:
+            fingerprint, df = self.datasets.frame(ticker)
+            results[ticker] = compute(fingerprint, df, params)
+        body = json.dumps({'fingerprints': fingerprints, 'results': results}, allow_nan=False).encode()
+        self.responses.put(key, (etag, body))
+        return etag, body
+
+    # Lot de requêtes en un seul appel : [{"endpoint": "kpis", "tickers": [...], ...}, ...]
+    def batch(self, requests):
+        results = []
+        for request in requests:
+            request = dict(request)
+            endpoint = request.pop('endpoint', 'series')
+            try:
+                _, body = self.query(endpoint, normalize_params(request))
+                results.append(json.loads(body))
+            except QueryError as e:
+                results.append({'error': str(e)})
+        return json.dumps({'results': results}, allow_nan=False).encode()
+
+
+# Paramètres de requête normalisés (chaîne de requête ou lot JSON) : tickers séparés
+# par des virgules, un indicateur par paramètre « field » (ou séparés par « ; »), dates
+# ramenées au jour
+def normalize_params(raw):
+    def values(key):
+        value = raw.get(key, [])
+        return [str(item) for item in (value if isinstance(value, list) else [value])]
+
+    params = {}
+    tickers = [t for value in values('ticker') + values('tickers') for t in value.split(",") if t]
+    if tickers:
+        params['tickers'] = tickers
+    fields = [f for value in values('field') + values('fields') for f in value.split(";") if f]
+    if fields:
+        params['fields'] = fields
+    for key in ('start', 'end'):
+        if values(key) and values(key)[0]:
+            try:
+                params[key] = str(pd.Timestamp(values(key)[0]).date())
+            except ValueError:
+                raise QueryError(f"Date invalide : {values(key)[0]}")
+    return params
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = "HTTP/1.1"
+    # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, l'algorithme de
+    # Nagle retarde chaque réponse d'une connexion persistante d'environ 40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode())
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/")
+        try:
+            if endpoint == "tickers":
+                datasets = self.service.datasets
+                body = {ticker: datasets.fingerprint(ticker) for ticker in datasets.tickers()}
+                self._send(200, json.dumps(body).encode())
+                return
+            params = normalize_params(parse_qs(url.query))
+            etag, body = self.service.query(endpoint, params, self.headers.get("If-None-Match"))
+        except QueryError as e:
+            self._error(e.status, str(e))
+            return
+        # Toute autre erreur reçoit une réponse plutôt qu'une connexion fermée
+        except Exception as e:
+            self._error(500, f"Erreur interne : {e}")
+            return
+        self._send(304 if body is None else 200, body or b"", etag)
+
+    def do_POST(self):
+        if urlsplit(self.path).path.strip("/") != "batch":
+            self._error(404, "Point d'accès inconnu")
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            requests = payload.get('requests', []) if isinstance(payload, dict) else payload
+            self._send(200, self.service.batch(requests))
+        except (ValueError, AttributeError) as e:
+            self._error(400, f"Requête invalide : {e}")
+        except Exception as e:
+            self._error(500, f"Erreur interne : {e}")
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    handler = type("Handler", (_Handler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON des indicateurs Safran")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--file", action="append", default=[], metavar="TICKER=FICHIER",
+                        help="Fichier de cotations par ticker (défaut : SAF=SAFRAN_data_bourse.txt sans base)")
+    parser.add_argument("--cache-entries", type=int, default=1024)
+    args = parser.parse_args()
+
+    files = dict(item.split("=", 1) for item in args.file)
+    store = store_from_env()
+    if not files and store is None:
+        files = {DEFAULT_TICKER: DATA_FILE}
+    server = make_server(QueryService(Datasets(files, store), args.cache_entries), args.host, args.port)
+    print(f"Service disponible sur http://{args.host}:{args.port} (/tickers, /series, /kpis, POST /batch)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
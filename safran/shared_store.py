@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Jeu de données partagé entre processus sous forme de colonnes .npy mappées en mémoire.
+# pyarrow (installé avec streamlit) permettrait un fichier Arrow IPC mappé, mais sa
+# conversion en DataFrame recopie en général les colonnes dans chaque processus ;
+# np.load(mmap_mode='r') fournit directement des tableaux NumPy adossés au cache de
+# pages, sans copie ni conversion.
+MANIFEST = "manifest.json"
+
+
+def default_root():
+    return os.environ.get("SAFRAN_SHARED_DIR", os.path.join(tempfile.gettempdir(), "safran_shared"))
+
+
+# Répertoire propre à un fichier source : ses versions successives y sont publiées,
+# sans interférer avec celles des autres sources partageant la même racine
+def source_key(path):
+    return hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+
+
+# Empreinte du fichier source : change dès que le fichier est remplacé ou modifié
+def source_fingerprint(path):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+# Écriture d'un DataFrame sous forme d'un fichier .npy par colonne (mappable en mémoire).
+# Les dates sont stockées en int64 (ns), le texte en catégories (codes entiers).
+def _write_frame(df, directory):
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {'name': str(name), 'file': f"{i}.npy"}
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.values.astype('datetime64[ns]').view('int64')
+            entry['kind'] = 'datetime'
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            entry['kind'] = 'numeric'
+        else:
+            categorical = pd.Categorical(series.astype(str).where(series.notna()))
+            values = categorical.codes
+            entry['kind'] = 'category'
+            entry['categories'] = list(categorical.categories)
+        np.save(os.path.join(directory, entry['file']), np.ascontiguousarray(values))
+        columns.append(entry)
+    np.save(os.path.join(directory, "index.npy"), np.asarray(df.index, dtype='int64'))
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump({'columns': columns, 'rows': len(df)}, f)
+
+
+# Publication atomique : écriture dans un répertoire temporaire puis renommage.
+# Si un autre processus a publié la même version entre-temps, sa copie est conservée.
+def publish(df, root, version):
+    os.makedirs(root, exist_ok=True)
+    target = os.path.join(root, version)
+    staging = tempfile.mkdtemp(prefix=f".{version}-", dir=root)
+    try:
+        _write_frame(df, staging)
+        os.rename(staging, target)
+    except OSError:
+        if not os.path.exists(os.path.join(target, MANIFEST)):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+# Ouverture en lecture seule d'une version publiée : les colonnes sont des vues
+# np.memmap, partagées via le cache de pages du système entre tous les processus
+def attach(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    data = {}
+    for entry in manifest['columns']:
+        # Vue ndarray simple sur le mappage (la sous-classe np.memmap n'est pas propagée)
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r').view(np.ndarray)
+        if entry['kind'] == 'datetime':
+            values = values.view('datetime64[ns]')
+        elif entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, entry['categories'])
+        data[entry['name']] = values
+    index = pd.Index(np.load(os.path.join(directory, "index.npy"), mmap_mode='r').view(np.ndarray), copy=False)
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+# Suppression des versions obsolètes d'une source ; les processus qui les ont encore ouvertes
+# conservent leur mappage jusqu'à fermeture
+def _prune(directory, keep):
+    for name in os.listdir(directory):
+        if name != keep and not name.startswith("."):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+# Jeu de données calculé une seule fois par version du fichier source puis partagé :
+# les processus suivants s'attachent à la version publiée sans recalcul ni copie.
+# Disposition : <racine>/<source_key(source)>/<version>
+def shared_frame(source_path, build, root=None, fingerprint=None):
+    directory = os.path.join(root or default_root(), source_key(source_path))
+    version = fingerprint or source_fingerprint(source_path)
+    target = os.path.join(directory, version)
+    if not os.path.exists(os.path.join(target, MANIFEST)):
+        publish(build(source_path), directory, version)
+        _prune(directory, version)
+    return attach(target)
@@ -0,0 +1,321 @@
+import argparse
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from safran import DEFAULT_TICKER
+from safran.ema import ema_ribbon
+from safran.garch import GarchFit, ewma_variance, fit_garch
+from safran.pipeline import DATA_FILE, compute_indicators
+from safran.seasonality import CUBE_COLUMNS, calendar_cube
+
+BAR_COLUMNS = ['ouv', 'haut', 'bas', 'clot', 'vol', 'devise']
+# Indicateurs calculés à l'ingestion sur tout l'historique (colonnes de compute_indicators(),
+# ruban exponentiel du tableau de bord, variances GARCH et EWMA) : les lectures par période
+# n'ont ainsi aucun recalcul ni historique à charger
+PIPELINE_COLUMNS = [
+    'MA_20', 'MA_50', 'Volatility', 'Daily_Return', 'BB_Middle', 'BB_Upper', 'BB_Lower',
+    'RSI', 'RSI_Wilder', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'VWAP', 'VWAP_Rolling', 'OBV', 'ATR', 'Stoch_K', 'Stoch_D'
+]
+RIBBON_SPANS = [8, 13, 21, 34, 55, 89]
+INDICATOR_COLUMNS = PIPELINE_COLUMNS + [f'EMA_{span}' for span in RIBBON_SPANS] + ['GARCH_Var', 'EWMA_Var']
+GARCH_COLUMNS = ['mu', 'omega', 'alpha', 'beta', 'loglik', 'nobs', 'converged', 'iterations', 'last_eps', 'last_variance']
+# Nombre minimal de rendements pour ajuster le GARCH à l'ingestion
+GARCH_MIN_RETURNS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    ouv REAL,
+    haut REAL,
+    bas REAL,
+    clot REAL,
+    vol REAL,
+    devise TEXT,
+    PRIMARY KEY (ticker, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS calendar_cube (
+    ticker TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    dow INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    count INTEGER,
+    total REAL,
+    total_sq REAL,
+    hits INTEGER,
+    PRIMARY KEY (ticker, period, dow, hour)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS indicators (
+    ticker TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    %s,
+    PRIMARY KEY (ticker, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS garch_fit (
+    ticker TEXT PRIMARY KEY,
+    mu REAL,
+    omega REAL,
+    alpha REAL,
+    beta REAL,
+    loglik REAL,
+    nobs INTEGER,
+    converged INTEGER,
+    iterations INTEGER,
+    last_eps REAL,
+    last_variance REAL
+);
+""" % ",\n    ".join(f"{column} REAL" for column in INDICATOR_COLUMNS)
+
+_BAR_SELECT = "b.ts, b.ouv, b.haut, b.bas, b.clot, b.vol, b.devise"
+_INDICATOR_SELECT = ", ".join(f"i.{column}" for column in INDICATOR_COLUMNS)
+_INDICATOR_JOIN = "LEFT JOIN indicators i ON i.ticker = b.ticker AND i.ts = b.ts"
+
+
+def _to_epoch(value):
+    return int(pd.Timestamp(value).timestamp())
+
+
+# Stockage des cotations dans une base SQLite locale (fichier, sans serveur).
+# La clé primaire (ticker, ts) sert d'index : les requêtes par période et les
+# agrégats sont exécutés par le moteur, sans charger tout l'historique en mémoire.
+class BarStore:
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def _to_frame(self, rows):
+        rows.insert(0, 'date', pd.to_datetime(rows.pop('ts'), unit='s'))
+        # SQLite stocke les NaN en NULL : une colonne entièrement vide est relue en objets
+        for column in rows.columns.intersection(INDICATOR_COLUMNS):
+            rows[column] = rows[column].astype(float)
+        return rows
+
+    # Sélection des barres, avec leurs indicateurs précalculés si demandé
+    def _select(self, indicators):
+        if indicators:
+            return f"SELECT {_BAR_SELECT}, {_INDICATOR_SELECT} FROM bars b {_INDICATOR_JOIN}"
+        return f"SELECT {_BAR_SELECT} FROM bars b"
+
+    # Ingestion en masse d'un fichier au format SAFRAN_data_bourse.txt, par blocs,
+    # dans une seule transaction, puis mise à jour du cube calendaire et des indicateurs
+    def ingest_file(self, path, ticker=DEFAULT_TICKER, chunksize=200_000):
+        count = 0
+        with self._lock, self._conn:
+            for chunk in pd.read_csv(path, sep="\t", chunksize=chunksize):
+                dates = pd.to_datetime(chunk['date'], format='%d/%m/%Y %H:%M')
+                ts = (dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+                rows = zip(
+                    [ticker] * len(chunk),
+                    ts.tolist(),
+                    *(chunk[column].tolist() for column in BAR_COLUMNS)
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO bars (ticker, ts, ouv, haut, bas, clot, vol, devise) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                count += len(chunk)
+        self.refresh_cube(ticker)
+        self.refresh_indicators(ticker)
+        return count
+
+    # Cube calendaire du ticker recalculé depuis ses clôtures (rendements en %)
+    def refresh_cube(self, ticker=DEFAULT_TICKER):
+        closes = self._read("SELECT ts, clot FROM bars WHERE ticker = ? ORDER BY ts", (ticker,))
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(closes['ts'], unit='s'),
+            'Daily_Return': closes['clot'].pct_change() * 100
+        })
+        cube = calendar_cube({ticker: frame})
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM calendar_cube WHERE ticker = ?", (ticker,))
+            self._conn.executemany(
+                f"INSERT INTO calendar_cube ({', '.join(CUBE_COLUMNS)}) VALUES ({', '.join('?' * len(CUBE_COLUMNS))})",
+                cube[CUBE_COLUMNS].itertuples(index=False, name=None)
+            )
+        return len(cube)
+
+    # Indicateurs du ticker recalculés sur tout son historique (une fois par ingestion).
+    # Le GARCH repart de l'ajustement enregistré, ce qui accélère sa convergence.
+    def refresh_indicators(self, ticker=DEFAULT_TICKER):
+        df = compute_indicators(self.query_range(ticker))
+        values = pd.concat([df[PIPELINE_COLUMNS], ema_ribbon(df['clot'], RIBBON_SPANS)], axis=1)
+        values['GARCH_Var'] = values['EWMA_Var'] = np.nan
+        returns = df['Daily_Return'].dropna()
+        fit = None
+        if len(returns) >= GARCH_MIN_RETURNS:
+            fit = fit_garch(returns.values, previous=self.garch_fit(ticker))
+            values.loc[returns.index, 'GARCH_Var'] = fit.variance
+            values.loc[returns.index, 'EWMA_Var'] = ewma_variance(returns.values - fit.mu)
+        ts = (df['date'] - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+        rows = zip([ticker] * len(df), ts.tolist(), *(values[column].tolist() for column in INDICATOR_COLUMNS))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM indicators WHERE ticker = ?", (ticker,))
+            self._conn.executemany(
+                f"INSERT INTO indicators (ticker, ts, {', '.join(INDICATOR_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(INDICATOR_COLUMNS) + 2))})",
+                rows
+            )
+            self._conn.execute("DELETE FROM garch_fit WHERE ticker = ?", (ticker,))
+            if fit is not None:
+                self._conn.execute(
+                    f"INSERT INTO garch_fit (ticker, {', '.join(GARCH_COLUMNS)}) VALUES ({', '.join('?' * (len(GARCH_COLUMNS) + 1))})",
+                    (ticker, fit.mu, fit.omega, fit.alpha, fit.beta, fit.loglik, fit.nobs,
+                     int(fit.converged), fit.iterations, fit.last_eps, float(fit.variance[-1]))
+                )
+        return len(df)
+
+    # Dernier ajustement GARCH enregistré (None si l'historique était trop court).
+    # Seule la dernière variance conditionnelle est conservée : la série complète
+    # est dans la colonne GARCH_Var des indicateurs.
+    def garch_fit(self, ticker=DEFAULT_TICKER):
+        rows = self._read(f"SELECT {', '.join(GARCH_COLUMNS)} FROM garch_fit WHERE ticker = ?", (ticker,))
+        if rows.empty:
+            return None
+        row = rows.iloc[0]
+        return GarchFit(
+            mu=float(row['mu']),
+            omega=float(row['omega']),
+            alpha=float(row['alpha']),
+            beta=float(row['beta']),
+            loglik=float(row['loglik']),
+            nobs=int(row['nobs']),
+            converged=bool(row['converged']),
+            iterations=int(row['iterations']),
+            variance=np.array([row['last_variance']], dtype=float),
+            last_eps=float(row['last_eps'])
+        )
+
+    # Indicateurs absents (base créée avant leur ajout, ou ingestion interrompue)
+    def indicators_missing(self, ticker=DEFAULT_TICKER):
+        return self._read("SELECT COUNT(*) AS n FROM indicators WHERE ticker = ?", (ticker,))['n'].iloc[0] == 0
+
+    # Cube calendaire précalculé (tous les tickers par défaut)
+    def seasonality_cube(self, tickers=None):
+        sql = f"SELECT {', '.join(CUBE_COLUMNS)} FROM calendar_cube"
+        params = []
+        if tickers:
+            sql += f" WHERE ticker IN ({', '.join('?' * len(tickers))})"
+            params = list(tickers)
+        return self._read(sql + " ORDER BY ticker, period, dow, hour", params)
+
+    def tickers(self):
+        return self._read("SELECT DISTINCT ticker FROM bars ORDER BY ticker")['ticker'].tolist()
+
+    # Nombre de barres et dernier horodatage : sert d'empreinte pour invalider les caches
+    def fingerprint(self, ticker=DEFAULT_TICKER):
+        row = self._read("SELECT COUNT(*) AS n, MAX(ts) AS last FROM bars WHERE ticker = ?", (ticker,)).iloc[0]
+        return int(row['n']), None if pd.isna(row['last']) else int(row['last'])
+
+    def date_bounds(self, ticker=DEFAULT_TICKER):
+        row = self._read("SELECT MIN(ts) AS first, MAX(ts) AS last FROM bars WHERE ticker = ?", (ticker,)).iloc[0]
+        if pd.isna(row['first']):
+            return None, None
+        return pd.to_datetime(row['first'], unit='s'), pd.to_datetime(row['last'], unit='s')
+
+    # Barres entre deux dates (bornes incluses, 'end' couvre toute la journée si c'est une date)
+    def query_range(self, ticker=DEFAULT_TICKER, start=None, end=None, indicators=False):
+        sql = self._select(indicators) + " WHERE b.ticker = ?"
+        params = [ticker]
+        if start is not None:
+            sql += " AND b.ts >= ?"
+            params.append(_to_epoch(start))
+        if end is not None:
+            sql += " AND b.ts < ?"
+            params.append(_to_epoch(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+        return self._to_frame(self._read(sql + " ORDER BY b.ts", params))
+
+    # Les 'n' dernières barres (parcours inverse de la clé primaire, sans lire le reste)
+    def tail(self, ticker=DEFAULT_TICKER, n=100, indicators=False):
+        rows = self._read(
+            f"SELECT * FROM ({self._select(indicators)} WHERE b.ticker = ? ORDER BY b.ts DESC LIMIT ?) ORDER BY ts",
+            (ticker, int(n))
+        )
+        return self._to_frame(rows)
+
+    # Statistiques d'une période calculées par le moteur SQL
+    def summary(self, ticker=DEFAULT_TICKER, start=None, end=None):
+        where = "ticker = ?"
+        params = [ticker]
+        if start is not None:
+            where += " AND ts >= ?"
+            params.append(_to_epoch(start))
+        if end is not None:
+            where += " AND ts < ?"
+            params.append(_to_epoch(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+        row = self._read(
+            f"""
+            SELECT
+                COUNT(*) AS days,
+                AVG(clot) AS mean_close,
+                SUM(clot * clot) AS sum_sq,
+                SUM(clot) AS sum_close,
+                SUM(vol) AS total_volume,
+                MIN(bas) AS low,
+                MAX(haut) AS high,
+                (SELECT clot FROM bars WHERE {where} ORDER BY ts LIMIT 1) AS first_close,
+                (SELECT clot FROM bars WHERE {where} ORDER BY ts DESC LIMIT 1) AS last_close
+            FROM bars WHERE {where}
+            """,
+            params * 3
+        ).iloc[0]
+        days = int(row['days'])
+        std = np.nan
+        if days > 1:
+            std = float(np.sqrt(max((row['sum_sq'] - row['sum_close'] ** 2 / days) / (days - 1), 0.0)))
+        return {
+            'days': days,
+            'mean_close': row['mean_close'],
+            'total_volume': row['total_volume'],
+            'low': row['low'],
+            'high': row['high'],
+            'first_close': row['first_close'],
+            'last_close': row['last_close'],
+            'std_close': std
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Base configurée par la variable d'environnement SAFRAN_DB (aucune par défaut)
+def store_from_env():
+    path = os.environ.get("SAFRAN_DB")
+    return BarStore(path) if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stockage SQLite des cotations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest = subparsers.add_parser("ingest", help="Importer un fichier de cotations tabulé")
+    ingest.add_argument("file", nargs="?", default=DATA_FILE)
+    ingest.add_argument("--db", default=os.environ.get("SAFRAN_DB", "safran.db"))
+    ingest.add_argument("--ticker", default=DEFAULT_TICKER)
+    args = parser.parse_args()
+
+    store = BarStore(args.db)
+    count = store.ingest_file(args.file, args.ticker)
+    print(f"{count} barres importées dans {args.db} ({args.ticker})")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
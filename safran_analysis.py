@@ -2,10 +2,29 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 from datetime import datetime
+import os
 import numpy as np
 from scipy import stats
 
+from safran import DEFAULT_TICKER
+from safran.alerts import DEFAULT_RULES, RULE_FIELDS, AlertEngine, LogSink, WebhookSink, parse_rules
+from safran.backtest import param_range, sweep
+from safran.ema import ema_ribbon
+from safran.garch import GarchCache, ewma_variance
+from safran.indicator_cache import IndicatorCache, warmup_bars
+from safran.levels import support_resistance
+from safran.live import LiveFeed
+from safran.montecarlo import simulate_paths
+from safran.ohlcv import volume_range_indicators
+from safran.pipeline import DATA_FILE, derived_columns, load_dataset, quarterly_summary
+from safran.risk import RiskEngine
+from safran.rolling import rolling_linregress, rolling_moments
+from safran.seasonality import calendar_cube, seasonality, seasonality_table
+from safran.shared_store import shared_frame, source_fingerprint
+from safran.storage import GARCH_MIN_RETURNS, RIBBON_SPANS, store_from_env
+
 # Configuration de la page
 st.set_page_config(
     page_title="Safran | Analyse Boursière Annuelle 2025-2026",
@@ -156,45 +175,118 @@ st.markdown(f"""
     </style>
 """, unsafe_allow_html=True)
 
+# Jeu de données publié une fois par version de sa source dans un stockage mappé en
+# mémoire, partagé par toutes les sessions et tous les processus serveur. La source est
+# la base SQLite si elle est configurée (le fichier n'est alors lu qu'à son alimentation),
+# le fichier de cotations sinon.
+@st.cache_resource(max_entries=2)
+def attach_dataset(fingerprint):
+    store = get_store()
+    if store is not None:
+        return shared_frame(store.path, lambda _: store.query_range(DEFAULT_TICKER, indicators=True), fingerprint=fingerprint)
+    return shared_frame(DATA_FILE, load_dataset, fingerprint=fingerprint)
+
+# Version du jeu de données : nombre de barres et dernier horodatage dans la base,
+# empreinte du fichier sans base
+def dataset_fingerprint():
+    store = get_store()
+    if store is not None:
+        n, last = store.fingerprint(DEFAULT_TICKER)
+        return f"{n}-{last}"
+    return source_fingerprint(DATA_FILE)
+
+# Colonnes dérivées et résumé trimestriel, calculés une fois par version du jeu de données
+# et servis sans copie (les sections ne font que les lire)
+@st.cache_resource(max_entries=2)
+def get_derived(fingerprint):
+    base = attach_dataset(fingerprint)
+    return derived_columns(base), quarterly_summary(base)
+
+# Cube calendaire des rendements (sans base SQLite : calculé une fois par version du fichier)
+@st.cache_resource(max_entries=2)
+def get_calendar_cube(fingerprint):
+    return calendar_cube({DEFAULT_TICKER: attach_dataset(fingerprint)})
+
+# Ajustements GARCH par (ticker, version des données), partagés par toutes les sessions
+@st.cache_resource
+def get_garch_cache():
+    return GarchCache(max_entries=8)
+
+# Cache LRU des indicateurs paramétrables, partagé par toutes les sessions
+@st.cache_resource
+def get_indicator_cache():
+    return IndicatorCache(max_entries=128)
+
 # Chargement des données avec gestion d'erreur
-@st.cache_data
 def load_data():
     try:
-        df = pd.read_csv("SAFRAN_data_bourse.txt", sep="\t")
-        df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y %H:%M')
-        df = df.sort_values('date')
-        
-        # Calcul des indicateurs techniques
-        df['MA_20'] = df['clot'].rolling(window=20).mean()
-        df['MA_50'] = df['clot'].rolling(window=50).mean()
-        df['Volatility'] = df['clot'].rolling(window=20).std()
-        df['Daily_Return'] = df['clot'].pct_change() * 100
-        
-        # Bandes de Bollinger
-        df['BB_Middle'] = df['clot'].rolling(window=20).mean()
-        df['BB_Upper'] = df['BB_Middle'] + 2 * df['clot'].rolling(window=20).std()
-        df['BB_Lower'] = df['BB_Middle'] - 2 * df['clot'].rolling(window=20).std()
-        
-        # RSI (Relative Strength Index)
-        delta = df['clot'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
+        df = attach_dataset(dataset_fingerprint())
         return df, None
     except FileNotFoundError:
         return None, "❌ Erreur : Le fichier 'SAFRAN_data_bourse.txt' n'a pas été trouvé."
     except Exception as e:
         return None, f"❌ Erreur lors du chargement des données : {str(e)}"
 
-# Chargement des données
-df, error = load_data()
+# Moteur de risque partagé entre les sessions (résultats mis en cache par fenêtre)
+@st.cache_resource
+def get_risk_engine(returns):
+    return RiskEngine(returns)
+
+# Simulation Monte-Carlo (répartie sur plusieurs processus au-delà de 100 000 trajectoires)
+@st.cache_data
+def run_simulation(returns, s0, horizon, n_paths, method, block_size, seed, thresholds):
+    n_jobs = (os.cpu_count() or 1) if n_paths >= 100_000 else 1
+    return simulate_paths(
+        returns, s0, horizon, n_paths,
+        method=method,
+        block_size=block_size,
+        seed=seed,
+        n_jobs=n_jobs,
+        thresholds=thresholds
+    )
+
+# Balayage d'une grille de paramètres (pool de processus pour les grandes grilles)
+@st.cache_data
+def run_sweep(strategy, close, cost_bps, **axes):
+    return sweep(strategy, close, cost_bps=cost_bps, n_jobs=os.cpu_count() or 1, **axes)
+
+# Niveaux de support/résistance et profil de volume (mis en cache par fenêtre)
+@st.cache_data
+def compute_levels(high, low, close, volume, order, tolerance):
+    return support_resistance(high, low, close, volume, order=order, tolerance=tolerance)
+
+# Flux temps réel partagé par toutes les sessions (un consommateur par source), avec son
+# moteur d'alertes (journal SAFRAN_ALERT_LOG et webhook SAFRAN_ALERT_WEBHOOK optionnels)
+@st.cache_resource
+def get_live_feed(source):
+    history, _ = load_data()
+    sinks = []
+    if os.environ.get("SAFRAN_ALERT_LOG"):
+        sinks.append(LogSink(os.environ["SAFRAN_ALERT_LOG"]))
+    if os.environ.get("SAFRAN_ALERT_WEBHOOK"):
+        sinks.append(WebhookSink(os.environ["SAFRAN_ALERT_WEBHOOK"]))
+    return LiveFeed(source, history=history, alerts=AlertEngine(parse_rules(DEFAULT_RULES), sinks))
 
-if error:
-    st.error(error)
-    st.info("💡 Assurez-vous que le fichier 'SAFRAN_data_bourse.txt' est présent dans le même répertoire.")
-    st.stop()
+# Base SQLite optionnelle (variable d'environnement SAFRAN_DB), alimentée au premier lancement
+@st.cache_resource
+def get_store():
+    store = store_from_env()
+    if store is not None and store.fingerprint(DEFAULT_TICKER)[0] == 0:
+        store.ingest_file(DATA_FILE, DEFAULT_TICKER)
+    elif store is not None:
+        if store.seasonality_cube([DEFAULT_TICKER]).empty:
+            store.refresh_cube(DEFAULT_TICKER)
+        if store.indicators_missing(DEFAULT_TICKER):
+            store.refresh_indicators(DEFAULT_TICKER)
+    return store
+
+# Dernières barres de la base avec leurs indicateurs précalculés (requête indexée)
+@st.cache_resource(max_entries=8)
+def load_recent(fingerprint, n):
+    return get_store().tail(DEFAULT_TICKER, n, indicators=True)
+
+store = get_store()
+indicator_cache = get_indicator_cache()
 
 # Header avec logo
 LOGO_URL = "https://www.1min30.com/wp-content/uploads/2018/05/Couleur-logo-Safran.jpg"
@@ -230,10 +322,20 @@ st.sidebar.markdown(f"""
 
 section = st.sidebar.radio(
     "NAVIGATION",
-    ["Vue d'ensemble", "Analyse Technique", "Performance", "Indicateurs Avancés", "Données"],
+    ["Vue d'ensemble", "Analyse Technique", "Performance", "Indicateurs Avancés", "Prévisions", "Backtest", "Temps Réel", "Données"],
     label_visibility="collapsed"
 )
 
+# Paramètres des indicateurs : chaque série est mise en cache par jeu de paramètres
+with st.sidebar.expander("⚙️ Paramètres des indicateurs"):
+    ma_short = st.slider("Moyenne mobile courte (jours)", 5, 100, 20, key="param_ma_short")
+    ma_long = st.slider("Moyenne mobile longue (jours)", 20, 200, 50, key="param_ma_long")
+    bb_window = st.slider("Bollinger : fenêtre (jours)", 5, 100, 20, key="param_bb_window")
+    bb_width = st.slider("Bollinger : largeur (écarts-types)", 1.0, 3.0, 2.0, step=0.1, key="param_bb_width")
+    rsi_period = st.slider("RSI : période (jours)", 2, 50, 14, key="param_rsi_period")
+    momentum_period = st.slider("Momentum (jours)", 1, 60, 10, key="param_momentum")
+    trend_window = st.slider("Tendance linéaire (jours)", 10, 250, 30, step=5, key="param_trend")
+
 st.sidebar.markdown("---")
 st.sidebar.markdown(f"""
     <div class="info-card">
@@ -245,14 +347,31 @@ st.sidebar.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
-# Calcul des statistiques globales
-current_price = df['clot'].iloc[-1]
-start_price = df['clot'].iloc[0]
-variation_total = ((current_price - start_price) / start_price) * 100
-max_price = df['clot'].max()
-min_price = df['clot'].min()
-avg_volume = df['vol'].mean()
-total_volume = df['vol'].sum()
+# Chargement des données (avec la base SQLite, « Analyse Technique » et « Données »
+# interrogent directement la base au lieu de charger tout l'historique ; les autres
+# sections lisent l'historique complet publié depuis la base)
+df = None
+if store is None or section not in ("Analyse Technique", "Données"):
+    df, error = load_data()
+
+    if error:
+        st.error(error)
+        st.info("💡 Assurez-vous que le fichier 'SAFRAN_data_bourse.txt' est présent dans le même répertoire.")
+        st.stop()
+
+    # Le jeu de données partagé est en lecture seule : les colonnes propres aux sections
+    # proviennent du cache dérivé
+    dataset_version = dataset_fingerprint()
+    derived, trimestre_stats = get_derived(dataset_version)
+
+    # Calcul des statistiques globales
+    current_price = df['clot'].iloc[-1]
+    start_price = df['clot'].iloc[0]
+    variation_total = ((current_price - start_price) / start_price) * 100
+    max_price = df['clot'].max()
+    min_price = df['clot'].min()
+    avg_volume = df['vol'].mean()
+    total_volume = df['vol'].sum()
 
 # ===========================
 # VUE D'ENSEMBLE
@@ -354,16 +473,16 @@ if section == "Vue d'ensemble":
     
     fig.add_trace(go.Scatter(
         x=df['date'],
-        y=df['MA_20'],
-        name='MM 20 jours',
+        y=indicator_cache.get(dataset_version, 'moving_average', df, window=ma_short),
+        name=f'MM {ma_short} jours',
         line=dict(color=ACCENT_COLOR, width=2),
         opacity=0.8
     ))
     
     fig.add_trace(go.Scatter(
         x=df['date'],
-        y=df['MA_50'],
-        name='MM 50 jours',
+        y=indicator_cache.get(dataset_version, 'moving_average', df, window=ma_long),
+        name=f'MM {ma_long} jours',
         line=dict(color='#FFD700', width=2),
         opacity=0.8
     ))
@@ -395,18 +514,15 @@ if section == "Vue d'ensemble":
     col1, col2 = st.columns(2)
     
     with col1:
-        df['Trimestre'] = df['date'].dt.to_period('Q').astype(str)
-        vol_trimestriel = df.groupby('Trimestre')['vol'].sum().reset_index()
-        
         fig_vol = px.bar(
-            vol_trimestriel,
+            trimestre_stats,
             x='Trimestre',
-            y='vol',
+            y='Volume_Total',
             title="Volume de transactions par trimestre",
-            labels={'vol': 'Volume total', 'Trimestre': 'Trimestre'},
-            color='vol',
+            labels={'Volume_Total': 'Volume total', 'Trimestre': 'Trimestre'},
+            color='Volume_Total',
             color_continuous_scale=[[0, SAFRAN_BLUE], [1, SAFRAN_RED]],
-            text='vol'
+            text='Volume_Total'
         )
         fig_vol.update_traces(texttemplate='%{text:.2s}', textposition='outside')
         fig_vol.update_layout(
@@ -419,26 +535,15 @@ if section == "Vue d'ensemble":
         st.plotly_chart(fig_vol, use_container_width=True)
     
     with col2:
-        df_temp = df.copy()
-        df_temp['Trimestre'] = df_temp['date'].dt.to_period('Q')
-        perf_trimestrielle = df_temp.groupby('Trimestre').agg({
-            'clot': ['first', 'last'],
-            'haut': 'max',
-            'bas': 'min'
-        }).reset_index()
-        perf_trimestrielle.columns = ['Trimestre', 'Ouverture', 'Cloture', 'Plus_Haut', 'Plus_Bas']
-        perf_trimestrielle['Performance'] = ((perf_trimestrielle['Cloture'] - perf_trimestrielle['Ouverture']) / perf_trimestrielle['Ouverture'] * 100)
-        perf_trimestrielle['Trimestre'] = perf_trimestrielle['Trimestre'].astype(str)
-        
         fig_perf = px.bar(
-            perf_trimestrielle,
+            trimestre_stats,
             x='Trimestre',
-            y='Performance',
+            y='Performance_%',
             title="Performance trimestrielle (%)",
-            labels={'Performance': 'Performance (%)', 'Trimestre': 'Trimestre'},
-            color='Performance',
+            labels={'Performance_%': 'Performance (%)', 'Trimestre': 'Trimestre'},
+            color='Performance_%',
             color_continuous_scale=[[0, SAFRAN_BLUE], [0.5, 'white'], [1, SAFRAN_RED]],
-            text='Performance'
+            text='Performance_%'
         )
         fig_perf.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
         fig_perf.update_layout(
@@ -454,16 +559,6 @@ if section == "Vue d'ensemble":
     st.markdown("---")
     st.subheader("Résumé Trimestriel Détaillé")
     
-    trimestre_stats = df.groupby(df['date'].dt.to_period('Q')).agg({
-        'clot': ['first', 'last', 'min', 'max', 'mean'],
-        'vol': 'sum',
-        'Daily_Return': 'std'
-    }).reset_index()
-    
-    trimestre_stats.columns = ['Trimestre', 'Prix_Début', 'Prix_Fin', 'Plus_Bas', 'Plus_Haut', 'Prix_Moyen', 'Volume_Total', 'Volatilité']
-    trimestre_stats['Performance_%'] = ((trimestre_stats['Prix_Fin'] - trimestre_stats['Prix_Début']) / trimestre_stats['Prix_Début'] * 100)
-    trimestre_stats['Trimestre'] = trimestre_stats['Trimestre'].astype(str)
-    
     def color_performance(val):
         if pd.isna(val):
             return ''
@@ -504,15 +599,27 @@ elif section == "Analyse Technique":
         selected_period = st.selectbox("Période", list(period_options.keys()), index=3)
         days_back = period_options[selected_period]
     
-    df_period = df.tail(min(days_back, len(df)))
+    # Avec la base SQLite, seules la période et son préchauffage sont lus ; les indicateurs
+    # fixes (MACD, volatilité, ruban, GARCH) proviennent de l'ingestion
+    if store is not None:
+        source_version = store.fingerprint(DEFAULT_TICKER)
+        df_source = load_recent(source_version, days_back + warmup_bars(bb_window, rsi_period))
+        indicator_version = (source_version, len(df_source))
+    else:
+        source_version = indicator_version = dataset_version
+        df_source = df
+    df_period = df_source.tail(min(days_back, len(df_source)))
+    bands = indicator_cache.get(indicator_version, 'bollinger', df_source, window=bb_window, width=bb_width).loc[df_period.index]
+    rsi_period_values = indicator_cache.get(indicator_version, 'rsi', df_source, period=rsi_period).loc[df_period.index]
+    rsi_wilder_values = indicator_cache.get(indicator_version, 'rsi_wilder', df_source, period=rsi_period).loc[df_period.index]
     
-    st.subheader("Bandes de Bollinger")
+    st.subheader(f"Bandes de Bollinger ({bb_window} jours, {bb_width:g}σ)")
     
     fig_bb = go.Figure()
     
     fig_bb.add_trace(go.Scatter(
         x=df_period['date'],
-        y=df_period['BB_Upper'],
+        y=bands['BB_Upper'],
         name='Bande Supérieure',
         line=dict(color='rgba(228, 0, 43, 0.3)', width=1),
         fill=None
@@ -520,7 +627,7 @@ elif section == "Analyse Technique":
     
     fig_bb.add_trace(go.Scatter(
         x=df_period['date'],
-        y=df_period['BB_Lower'],
+        y=bands['BB_Lower'],
         name='Bande Inférieure',
         line=dict(color='rgba(228, 0, 43, 0.3)', width=1),
         fill='tonexty',
@@ -529,7 +636,7 @@ elif section == "Analyse Technique":
     
     fig_bb.add_trace(go.Scatter(
         x=df_period['date'],
-        y=df_period['BB_Middle'],
+        y=bands['BB_Middle'],
         name='Moyenne Mobile',
         line=dict(color=ACCENT_COLOR, width=2)
     ))
@@ -556,16 +663,23 @@ elif section == "Analyse Technique":
     
     # RSI
     st.markdown("---")
-    st.subheader("RSI (Relative Strength Index)")
+    st.subheader(f"RSI (Relative Strength Index, {rsi_period} jours)")
     
     fig_rsi = go.Figure()
     
     fig_rsi.add_trace(go.Scatter(
         x=df_period['date'],
-        y=df_period['RSI'],
+        y=rsi_period_values,
         name='RSI',
         line=dict(color=SAFRAN_RED, width=2)
     ))
+
+    fig_rsi.add_trace(go.Scatter(
+        x=df_period['date'],
+        y=rsi_wilder_values,
+        name='RSI Wilder',
+        line=dict(color=ACCENT_COLOR, width=2, dash='dot')
+    ))
     
     fig_rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Surachat (70)")
     fig_rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Survente (30)")
@@ -584,7 +698,7 @@ elif section == "Analyse Technique":
     
     st.plotly_chart(fig_rsi, use_container_width=True)
     
-    current_rsi = df_period['RSI'].dropna().iloc[-1] if not df_period['RSI'].dropna().empty else 50
+    current_rsi = rsi_period_values.dropna().iloc[-1] if not rsi_period_values.dropna().empty else 50
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -603,9 +717,93 @@ elif section == "Analyse Technique":
         st.metric("Signal RSI", f"{rsi_color} {rsi_signal}")
     
     with col3:
-        rsi_avg = df_period['RSI'].mean()
+        rsi_avg = rsi_period_values.mean()
         st.metric("RSI Moyen (période)", f"{rsi_avg:.1f}")
     
+    # MACD
+    st.markdown("---")
+    st.subheader("MACD (12, 26, 9)")
+
+    fig_macd = go.Figure()
+
+    fig_macd.add_trace(go.Bar(
+        x=df_period['date'],
+        y=df_period['MACD_Hist'],
+        name='Histogramme',
+        marker_color=['green' if x > 0 else 'red' for x in df_period['MACD_Hist'].fillna(0)],
+        opacity=0.6
+    ))
+
+    fig_macd.add_trace(go.Scatter(
+        x=df_period['date'],
+        y=df_period['MACD'],
+        name='MACD',
+        line=dict(color=SAFRAN_RED, width=2)
+    ))
+
+    fig_macd.add_trace(go.Scatter(
+        x=df_period['date'],
+        y=df_period['MACD_Signal'],
+        name='Signal',
+        line=dict(color=ACCENT_COLOR, width=2)
+    ))
+
+    fig_macd.add_hline(y=0, line_color="white", opacity=0.5)
+
+    fig_macd.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="MACD (€)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_macd, use_container_width=True)
+
+    # Ruban de moyennes exponentielles
+    st.markdown("---")
+    st.subheader("Ruban de Moyennes Mobiles Exponentielles")
+
+    ribbon_spans = RIBBON_SPANS
+    if store is not None:
+        ribbon = df_period[[f'EMA_{span}' for span in ribbon_spans]]
+    else:
+        ribbon = ema_ribbon(df_source['clot'], ribbon_spans).loc[df_period.index]
+
+    fig_ribbon = go.Figure()
+
+    fig_ribbon.add_trace(go.Scatter(
+        x=df_period['date'],
+        y=df_period['clot'],
+        name='Cours de clôture',
+        line=dict(color='white', width=2)
+    ))
+
+    for i, span in enumerate(ribbon_spans):
+        share = i / (len(ribbon_spans) - 1)
+        fig_ribbon.add_trace(go.Scatter(
+            x=df_period['date'],
+            y=ribbon[f'EMA_{span}'],
+            name=f'MME {span}',
+            line=dict(color=f'rgba({int(228 * (1 - share))}, {int(61 * share)}, {int(43 + 79 * share)}, 0.9)', width=1.5)
+        ))
+
+    fig_ribbon.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=500,
+        xaxis_title="Date",
+        yaxis_title="Prix (€)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_ribbon, use_container_width=True)
+
     # Volatilité
     st.markdown("---")
     st.subheader("Analyse de la Volatilité")
@@ -633,6 +831,92 @@ elif section == "Analyse Technique":
     
     st.plotly_chart(fig_vol, use_container_width=True)
 
+    # Volatilité conditionnelle : GARCH(1,1) et EWMA RiskMetrics sur les rendements quotidiens
+    st.subheader("Volatilité Conditionnelle (GARCH et EWMA)")
+
+    garch_horizon = st.slider("Horizon de prévision (jours de bourse)", 5, 60, 20, step=5)
+    # Avec la base SQLite, l'ajustement et les variances conditionnelles sont ceux de l'ingestion
+    if store is not None:
+        garch = store.garch_fit(DEFAULT_TICKER)
+        variances = df_source[['GARCH_Var', 'EWMA_Var']]
+    else:
+        garch = None
+        returns_source = df_source['Daily_Return'].dropna()
+        if len(returns_source) >= GARCH_MIN_RETURNS:
+            garch = get_garch_cache().get(DEFAULT_TICKER, source_version, returns_source.values)
+            variances = pd.DataFrame({
+                'GARCH_Var': garch.variance,
+                'EWMA_Var': ewma_variance(returns_source.values - garch.mu)
+            }, index=returns_source.index)
+
+    if garch is None:
+        st.info("Historique insuffisant pour ajuster un modèle GARCH.")
+    else:
+        annualize = np.sqrt(252)
+        garch_vol = (np.sqrt(variances['GARCH_Var']) * annualize).reindex(df_period.index)
+        ewma_vol = (np.sqrt(variances['EWMA_Var']) * annualize).reindex(df_period.index)
+        realized_vol = (df_source['Daily_Return'].rolling(window=20).std() * annualize).reindex(df_period.index)
+        forecast_vol = garch.forecast(garch_horizon) * annualize
+        forecast_dates = pd.bdate_range(df_period['date'].iloc[-1] + pd.offsets.BDay(1), periods=garch_horizon)
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("α / β", f"{garch.alpha:.3f} / {garch.beta:.3f}")
+
+        with col2:
+            st.metric("Persistance (α + β)", f"{garch.persistence:.3f}", f"Demi-vie {garch.half_life:.1f} j" if np.isfinite(garch.half_life) else None, delta_color="off")
+
+        with col3:
+            st.metric("Volatilité Prévue J+1", f"{forecast_vol[0]:.1f}%")
+
+        with col4:
+            long_run = np.sqrt(garch.long_run_variance) * annualize
+            st.metric("Volatilité de Long Terme", f"{long_run:.1f}%" if np.isfinite(long_run) else "∞")
+
+        fig_garch = go.Figure()
+
+        fig_garch.add_trace(go.Scatter(
+            x=df_period['date'],
+            y=garch_vol,
+            name='GARCH(1,1)',
+            line=dict(color=SAFRAN_RED, width=2)
+        ))
+
+        fig_garch.add_trace(go.Scatter(
+            x=df_period['date'],
+            y=ewma_vol,
+            name='EWMA (λ = 0,94)',
+            line=dict(color=ACCENT_COLOR, width=2)
+        ))
+
+        fig_garch.add_trace(go.Scatter(
+            x=df_period['date'],
+            y=realized_vol,
+            name='Réalisée (20j)',
+            line=dict(color='gray', width=1, dash='dot')
+        ))
+
+        fig_garch.add_trace(go.Scatter(
+            x=forecast_dates,
+            y=forecast_vol,
+            name=f'Prévision GARCH ({garch_horizon}j)',
+            line=dict(color='#FFD700', width=2, dash='dash')
+        ))
+
+        fig_garch.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=450,
+            xaxis_title="Date",
+            yaxis_title="Volatilité annualisée (%)",
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+
+        st.plotly_chart(fig_garch, use_container_width=True)
+
 # ===========================
 # PERFORMANCE
 # ===========================
@@ -685,20 +969,40 @@ elif section == "Performance":
     
     col1, col2 = st.columns(2)
     
+    returns_pct = df['Daily_Return'].dropna()
+    # Ajustements sur tout l'historique : loi normale et loi de Student (méthode des moments)
+    full_fit = rolling_moments(returns_pct.values, len(returns_pct)).iloc[-1]
+
     with col1:
         fig_hist = px.histogram(
             df.dropna(subset=['Daily_Return']),
             x='Daily_Return',
             nbins=50,
+            histnorm='probability density',
             title="Histogramme des rendements quotidiens",
             labels={'Daily_Return': 'Rendement quotidien (%)'},
             color_discrete_sequence=[SAFRAN_RED]
         )
+        x_grid = np.linspace(returns_pct.min(), returns_pct.max(), 200)
+        fig_hist.add_trace(go.Scatter(
+            x=x_grid,
+            y=stats.norm.pdf(x_grid, full_fit['mean'], full_fit['std']),
+            name='Loi normale',
+            line=dict(color='white', width=2, dash='dash')
+        ))
+        if np.isfinite(full_fit['t_df']):
+            fig_hist.add_trace(go.Scatter(
+                x=x_grid,
+                y=stats.t.pdf(x_grid, full_fit['t_df'], full_fit['mean'], full_fit['t_scale']),
+                name=f"Student (ν={full_fit['t_df']:.1f})",
+                line=dict(color=ACCENT_COLOR, width=2)
+            ))
         fig_hist.update_layout(
             template='plotly_dark',
             paper_bgcolor=BG_COLOR,
             plot_bgcolor=SECOND_BG_COLOR,
-            showlegend=False
+            yaxis_title="Densité",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
         )
         st.plotly_chart(fig_hist, use_container_width=True)
     
@@ -717,18 +1021,71 @@ elif section == "Performance":
             showlegend=False
         )
         st.plotly_chart(fig_box, use_container_width=True)
+
+    # Asymétrie, queues de distribution et normalité sur fenêtre glissante
+    st.subheader("Moments Glissants et Normalité")
+
+    moments_window = st.slider("Fenêtre des moments (jours)", 20, 250, 60, step=5)
+    moments = rolling_moments(df['Daily_Return'], moments_window)
+    last_moments = moments.dropna(subset=['skew'])
+
+    if last_moments.empty:
+        st.info("Historique insuffisant pour cette fenêtre.")
+    else:
+        last_moments = last_moments.iloc[-1]
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Asymétrie", f"{last_moments['skew']:.2f}")
+
+        with col2:
+            st.metric("Excès de Kurtosis", f"{last_moments['kurtosis']:.2f}")
+
+        with col3:
+            st.metric(
+                "Jarque-Bera (p-value)",
+                f"{last_moments['jb_pvalue']:.3f}",
+                "Normalité rejetée" if last_moments['jb_pvalue'] < 0.05 else "Normalité acceptée",
+                delta_color="off"
+            )
+
+        with col4:
+            st.metric("ν Student", f"{last_moments['t_df']:.1f}" if np.isfinite(last_moments['t_df']) else "∞")
+
+        fig_moments = make_subplots(
+            rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+            subplot_titles=("Asymétrie et excès de kurtosis", "Statistique de Jarque-Bera", "Degrés de liberté de la loi de Student")
+        )
+        fig_moments.add_trace(go.Scatter(x=df['date'], y=moments['skew'], name='Asymétrie', line=dict(color=ACCENT_COLOR, width=2)), row=1, col=1)
+        fig_moments.add_trace(go.Scatter(x=df['date'], y=moments['kurtosis'], name='Excès de kurtosis', line=dict(color=SAFRAN_RED, width=2)), row=1, col=1)
+        fig_moments.add_trace(go.Scatter(x=df['date'], y=moments['jarque_bera'], name='Jarque-Bera', line=dict(color='#FFD700', width=2)), row=2, col=1)
+        # Seuil à 5 % de la loi du χ² à 2 degrés de liberté
+        fig_moments.add_hline(y=stats.chi2.ppf(0.95, 2), line_dash="dash", line_color="gray", row=2, col=1)
+        fig_moments.add_trace(go.Scatter(
+            x=df['date'],
+            y=moments['t_df'].where(np.isfinite(moments['t_df'])).clip(upper=50),
+            name='ν Student',
+            line=dict(color='white', width=2)
+        ), row=3, col=1)
+        fig_moments.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=750,
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        st.plotly_chart(fig_moments, use_container_width=True)
     
     # Rendements cumulés
     st.markdown("---")
     st.subheader("Rendements Cumulés")
     
-    df['Cumulative_Return'] = (1 + df['Daily_Return']/100).cumprod() - 1
-    
     fig_cumul = go.Figure()
     
     fig_cumul.add_trace(go.Scatter(
         x=df['date'],
-        y=df['Cumulative_Return'] * 100,
+        y=derived['Cumulative_Return'] * 100,
         name='Rendement cumulé',
         line=dict(color=SAFRAN_RED, width=3),
         fill='tozeroy',
@@ -773,6 +1130,190 @@ elif section == "Performance":
         win_rate = (positive_days / total_days) * 100 if total_days > 0 else 0
         st.metric("Taux de Jours Positifs", f"{win_rate:.1f}%")
 
+    # Analyse des risques
+    st.markdown("---")
+    st.subheader("Analyse des Risques")
+
+    risk = get_risk_engine(df['Daily_Return'] / 100)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        risk_window = st.slider("Fenêtre glissante (jours)", 10, 120, 60, step=5)
+    with col2:
+        var_level = st.selectbox("Niveau de confiance", [0.90, 0.95, 0.99], index=1, format_func=lambda x: f"{x:.0%}")
+    with col3:
+        var_method = st.radio("Méthode VaR", ["Historique", "Paramétrique"], horizontal=True)
+    var_method_key = 'historical' if var_method == "Historique" else 'parametric'
+
+    full_var, full_cvar = risk.var(var_level, var_method_key)
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric("Drawdown Maximum", f"{risk.max_drawdown() * 100:.2f}%")
+
+    with col2:
+        st.metric("Durée Max. sous l'eau", f"{risk.max_drawdown_duration()} jours")
+
+    with col3:
+        st.metric("Ratio de Sortino (annualisé)", f"{risk.sortino():.2f}")
+
+    with col4:
+        st.metric(f"VaR {var_level:.0%} (1 jour)", f"{full_var * 100:.2f}%")
+
+    with col5:
+        st.metric(f"CVaR {var_level:.0%} (1 jour)", f"{full_cvar * 100:.2f}%")
+
+    drawdown = risk.drawdown()
+
+    fig_dd = go.Figure()
+
+    fig_dd.add_trace(go.Scatter(
+        x=df['date'],
+        y=drawdown['drawdown'] * 100,
+        name='Drawdown',
+        line=dict(color=SAFRAN_RED, width=2),
+        fill='tozeroy',
+        fillcolor='rgba(228, 0, 43, 0.2)',
+        customdata=drawdown['duration'],
+        hovertemplate='%{y:.2f}% (%{customdata} jours)'
+    ))
+
+    fig_dd.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=400,
+        title="Drawdown depuis le plus haut",
+        xaxis_title="Date",
+        yaxis_title="Drawdown (%)",
+        hovermode='x unified'
+    )
+
+    st.plotly_chart(fig_dd, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_ratios = go.Figure()
+
+        fig_ratios.add_trace(go.Scatter(
+            x=df['date'],
+            y=risk.rolling_sharpe(risk_window),
+            name='Sharpe',
+            line=dict(color=ACCENT_COLOR, width=2)
+        ))
+
+        fig_ratios.add_trace(go.Scatter(
+            x=df['date'],
+            y=risk.rolling_sortino(risk_window),
+            name='Sortino',
+            line=dict(color='#FFD700', width=2)
+        ))
+
+        fig_ratios.add_hline(y=0, line_dash="dash", line_color="white", opacity=0.5)
+
+        fig_ratios.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            title=f"Sharpe et Sortino glissants ({risk_window} jours)",
+            xaxis_title="Date",
+            yaxis_title="Ratio annualisé",
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+
+        st.plotly_chart(fig_ratios, use_container_width=True)
+
+    with col2:
+        rolling_var = risk.rolling_var(risk_window, var_level, var_method_key)
+
+        fig_var = go.Figure()
+
+        fig_var.add_trace(go.Scatter(
+            x=df['date'],
+            y=rolling_var['VaR'] * 100,
+            name=f'VaR {var_level:.0%}',
+            line=dict(color=SAFRAN_RED, width=2)
+        ))
+
+        fig_var.add_trace(go.Scatter(
+            x=df['date'],
+            y=rolling_var['CVaR'] * 100,
+            name=f'CVaR {var_level:.0%}',
+            line=dict(color=SAFRAN_BLUE, width=2, dash='dash')
+        ))
+
+        fig_var.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            title=f"VaR / CVaR glissantes ({risk_window} jours)",
+            xaxis_title="Date",
+            yaxis_title="Perte potentielle (%)",
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+
+        st.plotly_chart(fig_var, use_container_width=True)
+
+    # Saisonnalité : vues calculées par sommes sur le cube calendaire précalculé
+    st.markdown("---")
+    st.subheader("Saisonnalité et Effets Calendaires")
+
+    cube = store.seasonality_cube() if store is not None else get_calendar_cube(dataset_version)
+    season_labels = {
+        'mean': "Rendement moyen (%)",
+        'hit_rate': "Taux de hausse (%)",
+        'volatility': "Volatilité (%)",
+        'count': "Nombre de séances"
+    }
+    season_periods = [f"{p // 100}-{p % 100:02d}" for p in sorted(cube['period'].unique())]
+    season_tickers = sorted(cube['ticker'].unique())
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+
+    with col1:
+        season_range = st.select_slider("Période (mois)", season_periods, value=(season_periods[0], season_periods[-1]))
+
+    with col2:
+        season_stat = st.selectbox("Statistique", list(season_labels), format_func=season_labels.get)
+
+    with col3:
+        selected_tickers = st.multiselect("Tickers", season_tickers, default=season_tickers)
+
+    season_start, season_end = pd.Timestamp(season_range[0]), pd.Timestamp(season_range[1])
+    midpoints = {'mean': 0, 'hit_rate': 50}
+
+    def season_heatmap(rows, columns, title):
+        table = seasonality_table(
+            seasonality(cube, rows, columns, season_start, season_end, selected_tickers or None),
+            season_stat
+        )
+        fig_season = px.imshow(
+            table,
+            aspect='auto',
+            text_auto='.2f' if season_stat != 'count' else True,
+            color_continuous_scale=[[0, SAFRAN_BLUE], [0.5, 'white'], [1, SAFRAN_RED]],
+            color_continuous_midpoint=midpoints.get(season_stat),
+            labels={'color': season_labels[season_stat]}
+        )
+        fig_season.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=400,
+            title=title
+        )
+        st.plotly_chart(fig_season, use_container_width=True)
+
+    season_heatmap('dow', 'month', f"{season_labels[season_stat]} par jour de semaine et par mois")
+
+    # Barres intrajournalières uniquement : effet de l'heure de cotation
+    if cube['hour'].nunique() > 1:
+        season_heatmap('dow', 'hour', f"{season_labels[season_stat]} par jour de semaine et par heure")
+
 # ===========================
 # INDICATEURS AVANCÉS
 # ===========================
@@ -781,10 +1322,37 @@ elif section == "Indicateurs Avancés":
     
     st.subheader("Niveaux de Support et Résistance")
     
-    recent_data = df.tail(min(60, len(df)))
-    resistance_levels = recent_data.nlargest(3, 'haut')['haut'].values
-    support_levels = recent_data.nsmallest(3, 'bas')['bas'].values
-    
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        pivot_order = st.slider("Fenêtre des pivots (jours de part et d'autre)", 2, 20, 5)
+
+    with col2:
+        level_tolerance = st.slider("Tolérance de regroupement (%)", 0.2, 3.0, 1.0, step=0.1)
+
+    # Historique court : tout est affiché, sans curseur (dont le minimum serait atteint)
+    with col3:
+        if len(df) > 30:
+            sr_display = st.slider("Historique affiché (jours)", 30, len(df), max(30, min(120, len(df))), step=10)
+        else:
+            sr_display = len(df)
+
+    levels, profile, profile_edges = compute_levels(df['haut'], df['bas'], df['clot'], df['vol'], pivot_order, level_tolerance / 100)
+    recent_data = df.tail(min(sr_display, len(df)))
+
+    # Trois niveaux les plus forts de chaque côté, classés du plus proche au plus éloigné
+    resistance_levels = levels[levels['type'] == 'resistance'].nlargest(3, 'strength').sort_values('price')['price'].values
+    support_levels = levels[levels['type'] == 'support'].nlargest(3, 'strength').sort_values('price', ascending=False)['price'].values
+
+    def level_items(prefix, values):
+        if len(values) == 0:
+            return f'<li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">Aucun niveau détecté</li>'
+        return "".join(
+            f'<li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">'
+            f'{prefix}{i}: <strong>{value:.2f} €</strong></li>'
+            for i, value in enumerate(values, 1)
+        )
+
     col1, col2 = st.columns(2)
     
     with col1:
@@ -792,15 +1360,7 @@ elif section == "Indicateurs Avancés":
             <div class="info-card">
                 <h4 style="color: {SAFRAN_RED}; margin-top: 0;">🔴 Niveaux de Résistance</h4>
                 <ul style="list-style: none; padding: 0;">
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        R1: <strong>{resistance_levels[0]:.2f} €</strong>
-                    </li>
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        R2: <strong>{resistance_levels[1]:.2f} €</strong>
-                    </li>
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        R3: <strong>{resistance_levels[2]:.2f} €</strong>
-                    </li>
+                    {level_items('R', resistance_levels)}
                 </ul>
             </div>
         """, unsafe_allow_html=True)
@@ -810,21 +1370,18 @@ elif section == "Indicateurs Avancés":
             <div class="info-card">
                 <h4 style="color: #4CAF50; margin-top: 0;">🟢 Niveaux de Support</h4>
                 <ul style="list-style: none; padding: 0;">
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        S1: <strong>{support_levels[0]:.2f} €</strong>
-                    </li>
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        S2: <strong>{support_levels[1]:.2f} €</strong>
-                    </li>
-                    <li style="padding: 0.5rem; margin: 0.3rem 0; background: {SECOND_BG_COLOR}; border-radius: 5px;">
-                        S3: <strong>{support_levels[2]:.2f} €</strong>
-                    </li>
+                    {level_items('S', support_levels)}
                 </ul>
             </div>
         """, unsafe_allow_html=True)
     
-    # Graphique S&R
-    fig_sr = go.Figure()
+    # Graphique S&R avec profil de volume
+    fig_sr = make_subplots(
+        rows=1, cols=2,
+        shared_yaxes=True,
+        column_widths=[0.8, 0.2],
+        horizontal_spacing=0.01
+    )
     
     fig_sr.add_trace(go.Candlestick(
         x=recent_data['date'],
@@ -835,7 +1392,16 @@ elif section == "Indicateurs Avancés":
         name='Safran',
         increasing_line_color=SAFRAN_RED,
         decreasing_line_color=SAFRAN_BLUE
-    ))
+    ), row=1, col=1)
+
+    fig_sr.add_trace(go.Bar(
+        x=profile,
+        y=(profile_edges[:-1] + profile_edges[1:]) / 2,
+        orientation='h',
+        name='Volume par prix',
+        marker_color=ACCENT_COLOR,
+        opacity=0.5
+    ), row=1, col=2)
     
     for i, r in enumerate(resistance_levels, 1):
         fig_sr.add_hline(
@@ -843,7 +1409,8 @@ elif section == "Indicateurs Avancés":
             line_dash="dash",
             line_color="red",
             annotation_text=f"R{i}: {r:.2f}€",
-            annotation_position="right"
+            annotation_position="right",
+            row=1, col=1
         )
     
     for i, s in enumerate(support_levels, 1):
@@ -852,7 +1419,8 @@ elif section == "Indicateurs Avancés":
             line_dash="dash",
             line_color="green",
             annotation_text=f"S{i}: {s:.2f}€",
-            annotation_position="right"
+            annotation_position="right",
+            row=1, col=1
         )
     
     fig_sr.update_layout(
@@ -861,8 +1429,10 @@ elif section == "Indicateurs Avancés":
         plot_bgcolor=SECOND_BG_COLOR,
         height=600,
         xaxis_title="Date",
+        xaxis2_title="Volume",
         yaxis_title="Prix (€)",
         hovermode='x unified',
+        showlegend=False,
         xaxis_rangeslider_visible=False
     )
     
@@ -872,19 +1442,19 @@ elif section == "Indicateurs Avancés":
     st.markdown("---")
     st.subheader("Momentum et Tendance")
     
-    df['Momentum'] = df['clot'] - df['clot'].shift(10)
-    
+    momentum_values = indicator_cache.get(dataset_version, 'momentum', df, period=momentum_period)
+
     col1, col2 = st.columns(2)
     
     with col1:
         fig_momentum = go.Figure()
         
-        colors = ['green' if x > 0 else 'red' for x in df['Momentum'].fillna(0)]
+        colors = ['green' if x > 0 else 'red' for x in momentum_values.fillna(0)]
         
         fig_momentum.add_trace(go.Bar(
             x=df['date'],
-            y=df['Momentum'],
-            name='Momentum (10j)',
+            y=momentum_values,
+            name=f'Momentum ({momentum_period}j)',
             marker_color=colors
         ))
         
@@ -894,7 +1464,7 @@ elif section == "Indicateurs Avancés":
             template='plotly_dark',
             paper_bgcolor=BG_COLOR,
             plot_bgcolor=SECOND_BG_COLOR,
-            title="Momentum sur 10 jours",
+            title=f"Momentum sur {momentum_period} jours",
             xaxis_title="Date",
             yaxis_title="Momentum (€)",
             showlegend=False
@@ -903,25 +1473,27 @@ elif section == "Indicateurs Avancés":
         st.plotly_chart(fig_momentum, use_container_width=True)
     
     with col2:
-        recent_30 = df.tail(min(30, len(df)))
-        x = np.arange(len(recent_30))
-        y = recent_30['clot'].values
+        recent_trend = df.tail(min(trend_window, len(df)))
+        x = np.arange(len(recent_trend))
+        y = recent_trend['clot'].values
         
-        if len(x) > 1:
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+        if len(x) > 2:
+            last_fit = indicator_cache.get(dataset_version, 'trend', df, window=trend_window)
+            slope, intercept = last_fit['slope'], last_fit['intercept']
+            r_value = np.sqrt(last_fit['r2'])
             trend_line = slope * x + intercept
             
             fig_trend = go.Figure()
             
             fig_trend.add_trace(go.Scatter(
-                x=recent_30['date'],
+                x=recent_trend['date'],
                 y=y,
                 name='Cours',
                 line=dict(color='white', width=2)
             ))
             
             fig_trend.add_trace(go.Scatter(
-                x=recent_30['date'],
+                x=recent_trend['date'],
                 y=trend_line,
                 name='Tendance',
                 line=dict(color=SAFRAN_RED, width=3, dash='dash')
@@ -931,7 +1503,7 @@ elif section == "Indicateurs Avancés":
                 template='plotly_dark',
                 paper_bgcolor=BG_COLOR,
                 plot_bgcolor=SECOND_BG_COLOR,
-                title=f"Tendance sur {len(recent_30)} jours (R²={r_value**2:.3f})",
+                title=f"Tendance sur {len(recent_trend)} jours (R²={r_value**2:.3f})",
                 xaxis_title="Date",
                 yaxis_title="Prix (€)",
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
@@ -952,13 +1524,79 @@ elif section == "Indicateurs Avancés":
                     <p style="margin: 0.5rem 0 0 0;">Pente: {slope:.3f} €/jour</p>
                 </div>
             """, unsafe_allow_html=True)
-    
-    # Volume
+
+    # Tendance glissante sur tout l'historique
     st.markdown("---")
-    st.subheader("Analyse des Volumes")
-    
-    df['Volume_MA'] = df['vol'].rolling(window=20).mean()
-    
+    st.subheader("Tendance Glissante")
+
+    trend_windows = st.multiselect(
+        "Fenêtres de régression (jours)",
+        [10, 20, 30, 60, 120],
+        default=[20, 60]
+    )
+
+    fig_rolling_trend = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        row_heights=[0.6, 0.2, 0.2]
+    )
+
+    fig_rolling_trend.add_trace(go.Scatter(
+        x=df['date'],
+        y=df['clot'],
+        name='Cours',
+        line=dict(color='white', width=2)
+    ), row=1, col=1)
+
+    trend_colors = [SAFRAN_RED, ACCENT_COLOR, '#FFD700', '#4CAF50', '#AB47BC']
+    for color, window in zip(trend_colors, sorted(trend_windows)):
+        fit = rolling_linregress(df['clot'], window)
+        fig_rolling_trend.add_trace(go.Scatter(
+            x=df['date'],
+            y=fit['trend'],
+            name=f'Tendance {window}j',
+            line=dict(color=color, width=2, dash='dash'),
+            legendgroup=str(window)
+        ), row=1, col=1)
+        fig_rolling_trend.add_trace(go.Scatter(
+            x=df['date'],
+            y=fit['slope'],
+            name=f'Pente {window}j',
+            line=dict(color=color, width=1.5),
+            error_y=dict(type='data', array=fit['stderr'], visible=False),
+            legendgroup=str(window),
+            showlegend=False
+        ), row=2, col=1)
+        fig_rolling_trend.add_trace(go.Scatter(
+            x=df['date'],
+            y=fit['r2'],
+            name=f'R² {window}j',
+            line=dict(color=color, width=1.5),
+            legendgroup=str(window),
+            showlegend=False
+        ), row=3, col=1)
+
+    fig_rolling_trend.add_hline(y=0, line_color="white", opacity=0.5, row=2, col=1)
+
+    fig_rolling_trend.update_yaxes(title_text="Prix (€)", row=1, col=1)
+    fig_rolling_trend.update_yaxes(title_text="Pente (€/j)", row=2, col=1)
+    fig_rolling_trend.update_yaxes(title_text="R²", range=[0, 1], row=3, col=1)
+    fig_rolling_trend.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=700,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_rolling_trend, use_container_width=True)
+
+    # Volume
+    st.markdown("---")
+    st.subheader("Analyse des Volumes")
+    
     fig_vol_analysis = go.Figure()
     
     colors_vol = [SAFRAN_RED if df['clot'].iloc[i] > df['ouv'].iloc[i] else SAFRAN_BLUE 
@@ -974,7 +1612,7 @@ elif section == "Indicateurs Avancés":
     
     fig_vol_analysis.add_trace(go.Scatter(
         x=df['date'],
-        y=df['Volume_MA'],
+        y=derived['Volume_MA'],
         name='Moyenne Mobile Volume (20j)',
         line=dict(color=ACCENT_COLOR, width=2)
     ))
@@ -992,6 +1630,627 @@ elif section == "Indicateurs Avancés":
     
     st.plotly_chart(fig_vol_analysis, use_container_width=True)
 
+    # Indicateurs de volume et d'amplitude
+    st.markdown("---")
+    st.subheader("VWAP, OBV, ATR et Stochastique")
+
+    vwap_anchor = st.date_input(
+        "Ancrage du VWAP",
+        df['date'].min().date(),
+        min_value=df['date'].min().date(),
+        max_value=df['date'].max().date()
+    )
+    anchor_position = int((df['date'].dt.date < vwap_anchor).sum())
+    anchored_vwap = df['VWAP']
+    if anchor_position > 0:
+        anchored_vwap = volume_range_indicators(df['haut'], df['bas'], df['clot'], df['vol'], anchor=anchor_position)['VWAP'].values
+
+    fig_vwap = go.Figure()
+
+    fig_vwap.add_trace(go.Scatter(
+        x=df['date'],
+        y=df['clot'],
+        name='Cours de clôture',
+        line=dict(color='white', width=2)
+    ))
+
+    fig_vwap.add_trace(go.Scatter(
+        x=df['date'],
+        y=anchored_vwap,
+        name=f"VWAP ancré ({vwap_anchor.strftime('%d/%m/%Y')})",
+        line=dict(color=SAFRAN_RED, width=2)
+    ))
+
+    fig_vwap.add_trace(go.Scatter(
+        x=df['date'],
+        y=df['VWAP_Rolling'],
+        name='VWAP glissant (20j)',
+        line=dict(color=ACCENT_COLOR, width=2, dash='dash')
+    ))
+
+    fig_vwap.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=450,
+        xaxis_title="Date",
+        yaxis_title="Prix (€)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_vwap, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_obv = go.Figure()
+
+        fig_obv.add_trace(go.Scatter(
+            x=df['date'],
+            y=df['OBV'],
+            name='OBV',
+            line=dict(color=ACCENT_COLOR, width=2),
+            fill='tozeroy',
+            fillcolor='rgba(0, 184, 212, 0.2)'
+        ))
+
+        fig_obv.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            title="On-Balance Volume",
+            xaxis_title="Date",
+            yaxis_title="OBV",
+            showlegend=False
+        )
+
+        st.plotly_chart(fig_obv, use_container_width=True)
+
+    with col2:
+        fig_atr = go.Figure()
+
+        fig_atr.add_trace(go.Scatter(
+            x=df['date'],
+            y=df['ATR'],
+            name='ATR (14j)',
+            line=dict(color=SAFRAN_RED, width=2)
+        ))
+
+        fig_atr.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            title="Average True Range (14 jours)",
+            xaxis_title="Date",
+            yaxis_title="ATR (€)",
+            showlegend=False
+        )
+
+        st.plotly_chart(fig_atr, use_container_width=True)
+
+    fig_stoch = go.Figure()
+
+    fig_stoch.add_trace(go.Scatter(
+        x=df['date'],
+        y=df['Stoch_K'],
+        name='%K (14j)',
+        line=dict(color=SAFRAN_RED, width=2)
+    ))
+
+    fig_stoch.add_trace(go.Scatter(
+        x=df['date'],
+        y=df['Stoch_D'],
+        name='%D (3j)',
+        line=dict(color=ACCENT_COLOR, width=2, dash='dash')
+    ))
+
+    fig_stoch.add_hline(y=80, line_dash="dash", line_color="red", annotation_text="Surachat (80)")
+    fig_stoch.add_hline(y=20, line_dash="dash", line_color="green", annotation_text="Survente (20)")
+
+    fig_stoch.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=400,
+        title="Oscillateur Stochastique",
+        xaxis_title="Date",
+        yaxis_title="Stochastique",
+        yaxis_range=[0, 100],
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_stoch, use_container_width=True)
+
+# ===========================
+# PRÉVISIONS
+# ===========================
+elif section == "Prévisions":
+    st.header("Prévisions par Simulation Monte-Carlo")
+
+    method_options = {
+        "Mouvement brownien géométrique": 'gbm',
+        "Bootstrap": 'bootstrap',
+        "Bootstrap par blocs": 'block'
+    }
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        selected_method = st.selectbox("Méthode", list(method_options.keys()))
+
+    with col2:
+        n_paths = st.selectbox(
+            "Nombre de trajectoires",
+            [1_000, 10_000, 100_000, 1_000_000],
+            index=2,
+            format_func=lambda x: f"{x:,}".replace(",", " ")
+        )
+
+    with col3:
+        horizon = st.slider("Horizon (jours de bourse)", 5, 252, 60, step=5)
+
+    with col4:
+        seed = st.number_input("Graine aléatoire", min_value=0, value=42, step=1)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        upper_pct = st.number_input("Seuil haussier (%)", min_value=1.0, max_value=200.0, value=10.0, step=1.0)
+
+    with col2:
+        lower_pct = st.number_input("Seuil baissier (%)", min_value=1.0, max_value=99.0, value=10.0, step=1.0)
+
+    with col3:
+        block_size = st.slider("Taille des blocs (jours)", 2, 40, 10, disabled=method_options[selected_method] != 'block')
+
+    upper_threshold = round(current_price * (1 + upper_pct / 100), 2)
+    lower_threshold = round(current_price * (1 - lower_pct / 100), 2)
+
+    simulation = run_simulation(
+        df['Daily_Return'],
+        current_price,
+        horizon,
+        n_paths,
+        method_options[selected_method],
+        block_size,
+        int(seed),
+        (upper_threshold, lower_threshold)
+    )
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    percentiles = simulation.percentiles()
+    median_final = percentiles[50].iloc[-1]
+
+    with col1:
+        st.metric(
+            "Cours médian à l'horizon",
+            f"{median_final:.2f} €",
+            f"{(median_final - current_price) / current_price * 100:+.2f}%"
+        )
+
+    with col2:
+        st.metric(f"P(clôture > {upper_threshold:.2f} €)", f"{simulation.prob_above(upper_threshold) * 100:.1f}%")
+
+    with col3:
+        st.metric(f"P(toucher {upper_threshold:.2f} €)", f"{simulation.prob_touch(upper_threshold) * 100:.1f}%")
+
+    with col4:
+        st.metric(f"P(clôture < {lower_threshold:.2f} €)", f"{(1 - simulation.prob_above(lower_threshold)) * 100:.1f}%")
+
+    with col5:
+        st.metric(f"P(toucher {lower_threshold:.2f} €)", f"{simulation.prob_touch(lower_threshold) * 100:.1f}%")
+
+    st.markdown("---")
+    st.subheader("Éventail des Trajectoires Simulées")
+
+    last_date = df['date'].iloc[-1]
+    future_dates = pd.bdate_range(last_date, periods=horizon + 1)[1:]
+    history = df.tail(min(120, len(df)))
+
+    fig_fan = go.Figure()
+
+    fig_fan.add_trace(go.Scatter(
+        x=history['date'],
+        y=history['clot'],
+        name='Historique',
+        line=dict(color='white', width=2)
+    ))
+
+    for path in simulation.sample_paths:
+        fig_fan.add_trace(go.Scatter(
+            x=future_dates,
+            y=path,
+            line=dict(color='rgba(176, 190, 197, 0.15)', width=1),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+
+    for low, high, alpha, label in [(5, 95, 0.15, '5% - 95%'), (25, 75, 0.3, '25% - 75%')]:
+        fig_fan.add_trace(go.Scatter(
+            x=future_dates,
+            y=percentiles[high],
+            line=dict(color='rgba(228, 0, 43, 0)', width=0),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        fig_fan.add_trace(go.Scatter(
+            x=future_dates,
+            y=percentiles[low],
+            name=f'Intervalle {label}',
+            line=dict(color='rgba(228, 0, 43, 0)', width=0),
+            fill='tonexty',
+            fillcolor=f'rgba(228, 0, 43, {alpha})'
+        ))
+
+    fig_fan.add_trace(go.Scatter(
+        x=future_dates,
+        y=percentiles[50],
+        name='Médiane',
+        line=dict(color=ACCENT_COLOR, width=3)
+    ))
+
+    fig_fan.add_hline(y=upper_threshold, line_dash="dash", line_color="green", annotation_text=f"Seuil haussier: {upper_threshold:.2f}€")
+    fig_fan.add_hline(y=lower_threshold, line_dash="dash", line_color="red", annotation_text=f"Seuil baissier: {lower_threshold:.2f}€")
+
+    fig_fan.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=600,
+        xaxis_title="Date",
+        yaxis_title="Prix (€)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig_fan, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("Distribution du Cours à l'Horizon")
+
+    prices, probabilities = simulation.terminal_distribution()
+    visible = (prices >= percentiles[5].iloc[-1] * 0.8) & (prices <= percentiles[95].iloc[-1] * 1.2)
+
+    fig_terminal = go.Figure()
+
+    fig_terminal.add_trace(go.Bar(
+        x=prices[visible],
+        y=probabilities[visible] * 100,
+        name='Probabilité',
+        marker_color=SAFRAN_RED
+    ))
+
+    fig_terminal.add_vline(x=current_price, line_dash="dash", line_color="white", annotation_text="Cours actuel")
+
+    fig_terminal.update_layout(
+        template='plotly_dark',
+        paper_bgcolor=BG_COLOR,
+        plot_bgcolor=SECOND_BG_COLOR,
+        height=400,
+        xaxis_title="Prix à l'horizon (€)",
+        yaxis_title="Probabilité (%)",
+        bargap=0,
+        showlegend=False
+    )
+
+    st.plotly_chart(fig_terminal, use_container_width=True)
+
+# ===========================
+# BACKTEST
+# ===========================
+elif section == "Backtest":
+    st.header("Backtest des Stratégies")
+
+    metric_labels = {
+        'sharpe': "Ratio de Sharpe",
+        'total_return': "Rendement total",
+        'max_drawdown': "Drawdown maximum",
+        'trades': "Nombre de trades",
+        'exposure': "Exposition"
+    }
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        heatmap_metric = st.selectbox("Métrique", list(metric_labels.keys()), format_func=metric_labels.get)
+
+    with col2:
+        cost_bps = st.number_input("Frais de transaction (points de base)", min_value=0.0, max_value=100.0, value=5.0, step=1.0)
+
+    def show_sweep_results(result, x_axis, y_axis, fixed=None):
+        frame = result.to_frame()
+        if fixed:
+            for name, value in fixed.items():
+                frame = frame[frame[name] == value]
+
+        if frame.empty:
+            st.warning("⚠️ Aucune combinaison valide pour cette grille.")
+            return
+
+        st.caption(f"{result.metrics['sharpe'].size:,} combinaisons évaluées".replace(",", " "))
+
+        heatmap = frame.pivot(index=y_axis, columns=x_axis, values=heatmap_metric)
+        fig_heatmap = px.imshow(
+            heatmap,
+            origin='lower',
+            aspect='auto',
+            color_continuous_scale=[[0, SAFRAN_BLUE], [0.5, 'white'], [1, SAFRAN_RED]],
+            labels={'color': metric_labels[heatmap_metric]}
+        )
+        fig_heatmap.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=500,
+            title=f"{metric_labels[heatmap_metric]} par combinaison de paramètres"
+        )
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+
+        # Meilleures combinaisons parmi celles de la carte de chaleur (période RSI fixée)
+        best = frame.nlargest(5, heatmap_metric)
+
+        fig_equity = go.Figure()
+
+        fig_equity.add_trace(go.Scatter(
+            x=df['date'],
+            y=(df['clot'] / df['clot'].iloc[0] - 1) * 100,
+            name='Achat et conservation',
+            line=dict(color='white', width=2, dash='dash')
+        ))
+
+        for color, (_, row) in zip([SAFRAN_RED, ACCENT_COLOR, '#FFD700', '#4CAF50', '#AB47BC'], best.iterrows()):
+            params = {name: row[name] for name in result.axes}
+            label = ", ".join(f"{name}={value:g}" for name, value in params.items())
+            fig_equity.add_trace(go.Scatter(
+                x=df['date'],
+                y=(result.equity_curve(**params) - 1) * 100,
+                name=label,
+                line=dict(color=color, width=2)
+            ))
+
+        fig_equity.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=500,
+            title="Courbes de capital des 5 meilleures combinaisons",
+            xaxis_title="Date",
+            yaxis_title="Rendement cumulé (%)",
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        st.plotly_chart(fig_equity, use_container_width=True)
+
+        st.dataframe(
+            best.style.format({
+                'total_return': '{:+.2%}',
+                'sharpe': '{:.2f}',
+                'max_drawdown': '{:.2%}',
+                'trades': '{:.0f}',
+                'exposure': '{:.0%}'
+            }),
+            use_container_width=True
+        )
+
+    tab_ma, tab_rsi, tab_bb = st.tabs(["Croisement de moyennes mobiles", "RSI Surachat / Survente", "Bandes de Bollinger"])
+
+    with tab_ma:
+        col1, col2 = st.columns(2)
+        with col1:
+            fast_range = st.slider("Moyenne rapide (jours)", 2, 100, (5, 40))
+        with col2:
+            slow_range = st.slider("Moyenne lente (jours)", 10, 200, (20, 120))
+
+        ma_result = run_sweep(
+            'ma_crossover', df['clot'], cost_bps,
+            fast=tuple(param_range(*fast_range, 1)),
+            slow=tuple(param_range(*slow_range, 1))
+        )
+        show_sweep_results(ma_result, 'fast', 'slow')
+
+    with tab_rsi:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            period_range = st.slider("Période RSI (jours)", 2, 50, (5, 30))
+        with col2:
+            lower_range = st.slider("Seuil de survente", 5, 50, (15, 40))
+        with col3:
+            upper_range = st.slider("Seuil de surachat", 50, 95, (60, 85))
+
+        rsi_result = run_sweep(
+            'rsi', df['clot'], cost_bps,
+            period=tuple(param_range(*period_range, 1)),
+            lower=tuple(param_range(*lower_range, 1)),
+            upper=tuple(param_range(*upper_range, 1))
+        )
+        best_period = int(rsi_result.top(heatmap_metric, 1)['period'].iloc[0]) if not rsi_result.to_frame().empty else period_range[0]
+        rsi_periods = rsi_result.axes['period']
+        selected_rsi_period = st.selectbox("Période affichée", rsi_periods, index=rsi_periods.index(best_period))
+        show_sweep_results(rsi_result, 'lower', 'upper', fixed={'period': selected_rsi_period})
+
+    with tab_bb:
+        col1, col2 = st.columns(2)
+        with col1:
+            window_range = st.slider("Fenêtre (jours)", 5, 100, (10, 60))
+        with col2:
+            width_range = st.slider("Largeur des bandes (σ)", 0.5, 4.0, (1.0, 3.0), step=0.1)
+
+        bb_result = run_sweep(
+            'bollinger', df['clot'], cost_bps,
+            window=tuple(param_range(*window_range, 1)),
+            width=tuple(param_range(width_range[0], width_range[1], 0.1))
+        )
+        show_sweep_results(bb_result, 'window', 'width')
+
+# ===========================
+# TEMPS RÉEL
+# ===========================
+elif section == "Temps Réel":
+    st.header("Suivi en Temps Réel")
+
+    col1, col2, col3 = st.columns([3, 1, 1])
+
+    with col1:
+        live_source = st.text_input(
+            "Source des ticks",
+            "tcp://127.0.0.1:9009",
+            help="Socket « tcp://hôte:port » ou chemin d'un fichier de ticks (horodatage, prix, volume séparés par des tabulations)"
+        )
+
+    with col2:
+        refresh_seconds = st.select_slider("Rafraîchissement (s)", [0.5, 1.0, 2.0, 5.0], value=1.0)
+
+    feed = get_live_feed(live_source)
+
+    with col3:
+        st.write("")
+        if feed.running:
+            if st.button("⏹ Arrêter"):
+                feed.stop()
+                st.rerun()
+        else:
+            if st.button("▶ Démarrer"):
+                feed.start()
+                st.rerun()
+
+    st.caption("💡 Pour rejouer l'historique comme un flux de marché : python -m safran.replay_server --start 2025-12-01")
+
+    with st.expander("🔔 Règles d'alerte"):
+        st.caption(
+            "Une règle par ligne : « nom: gauche opérateur droite [TICKERS] ». Opérateurs : >, <, >=, <=, "
+            f"crosses above, crosses below, crosses. Colonnes : {', '.join(RULE_FIELDS)}."
+        )
+        rules_text = st.text_area("Règles", "\n".join(str(rule) for rule in feed.alerts.rules), height=200, label_visibility="collapsed")
+        if st.button("Appliquer les règles"):
+            try:
+                feed.set_alert_rules(parse_rules(rules_text))
+                st.success(f"{len(feed.alerts.rules)} règles actives")
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+    # Seules ces deux zones sont réexécutées à chaque rafraîchissement
+    @st.fragment(run_every=refresh_seconds)
+    def live_metrics():
+        snapshot = feed.snapshot()
+        current = snapshot['current']
+
+        if snapshot['error']:
+            st.warning(f"⚠️ Flux interrompu : {snapshot['error']}")
+
+        if current is None:
+            st.info("En attente des premiers ticks..." if feed.running else "Flux arrêté.")
+            return
+
+        bars = snapshot['bars']
+        previous_close = bars['clot'].iloc[-1] if len(bars) else current['ouv']
+        variation = (current['clot'] - previous_close) / previous_close * 100
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            st.metric("Dernier Cours", f"{current['clot']:.2f} €", f"{variation:+.2f}%")
+
+        with col2:
+            st.metric("Volume de la Séance", f"{current['vol']/1000:.0f}K")
+
+        with col3:
+            st.metric("RSI (14)", f"{current['RSI']:.1f}")
+
+        with col4:
+            st.metric("MACD", f"{current['MACD']:.2f}", f"{current['MACD_Hist']:+.2f}")
+
+        with col5:
+            st.metric("Ticks Reçus", f"{snapshot['ticks']:,}".replace(",", " "), snapshot['last_tick'].strftime('%d/%m %H:%M:%S'))
+
+    @st.fragment(run_every=refresh_seconds)
+    def live_chart():
+        snapshot = feed.snapshot()
+        if snapshot['current'] is None:
+            return
+
+        live_bars = pd.concat([snapshot['bars'], pd.DataFrame([snapshot['current']])], ignore_index=True).tail(120)
+
+        fig_live = go.Figure()
+
+        fig_live.add_trace(go.Candlestick(
+            x=live_bars['date'],
+            open=live_bars['ouv'],
+            high=live_bars['haut'],
+            low=live_bars['bas'],
+            close=live_bars['clot'],
+            name='Safran',
+            increasing_line_color=SAFRAN_RED,
+            decreasing_line_color=SAFRAN_BLUE
+        ))
+
+        fig_live.add_trace(go.Scatter(
+            x=live_bars['date'],
+            y=live_bars['MA_20'],
+            name='MM 20 jours',
+            line=dict(color=ACCENT_COLOR, width=2)
+        ))
+
+        fig_live.add_trace(go.Scatter(
+            x=live_bars['date'],
+            y=live_bars['MA_50'],
+            name='MM 50 jours',
+            line=dict(color='#FFD700', width=2)
+        ))
+
+        fig_live.add_trace(go.Scatter(
+            x=live_bars['date'],
+            y=live_bars['BB_Upper'],
+            name='Bande Supérieure',
+            line=dict(color='rgba(228, 0, 43, 0.5)', width=1, dash='dot')
+        ))
+
+        fig_live.add_trace(go.Scatter(
+            x=live_bars['date'],
+            y=live_bars['BB_Lower'],
+            name='Bande Inférieure',
+            line=dict(color='rgba(228, 0, 43, 0.5)', width=1, dash='dot')
+        ))
+
+        fig_live.update_layout(
+            template='plotly_dark',
+            paper_bgcolor=BG_COLOR,
+            plot_bgcolor=SECOND_BG_COLOR,
+            height=600,
+            xaxis_title="Date",
+            yaxis_title="Prix (€)",
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            xaxis_rangeslider_visible=False,
+            uirevision='live'
+        )
+
+        st.plotly_chart(fig_live, use_container_width=True)
+
+    @st.fragment(run_every=refresh_seconds)
+    def live_alerts():
+        alerts = feed.recent_alerts()
+        if not alerts:
+            st.caption("Aucune alerte déclenchée.")
+            return
+        st.dataframe(
+            pd.DataFrame(alerts[::-1])[['time', 'ticker', 'rule', 'expression', 'left', 'right']].rename(columns={
+                'time': 'Barre', 'ticker': 'Ticker', 'rule': 'Règle', 'expression': 'Condition',
+                'left': 'Valeur', 'right': 'Seuil'
+            }),
+            use_container_width=True,
+            height=250
+        )
+
+    live_metrics()
+    st.markdown("---")
+    live_chart()
+    st.markdown("---")
+    st.subheader("Alertes")
+    live_alerts()
+
 # ===========================
 # DONNÉES
 # ===========================
@@ -1000,44 +2259,62 @@ elif section == "Données":
     
     col1, col2, col3 = st.columns(3)
     
+    if store is not None:
+        first_date, last_date = store.date_bounds(DEFAULT_TICKER)
+    else:
+        first_date, last_date = df['date'].min(), df['date'].max()
+
     with col1:
-        start_date = st.date_input("Date de début", df['date'].min().date())
+        start_date = st.date_input("Date de début", first_date.date())
     
     with col2:
-        end_date = st.date_input("Date de fin", df['date'].max().date())
+        end_date = st.date_input("Date de fin", last_date.date())
     
     with col3:
         st.write("")
         st.write("")
         export_format = st.radio("Format d'export", ["CSV", "Excel"], horizontal=True)
     
-    mask = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
-    df_filtered = df[mask].copy()
+    # Avec la base SQLite, filtre et agrégats sont exécutés par le moteur
+    if store is not None:
+        df_filtered = store.query_range(DEFAULT_TICKER, start_date, end_date)
+        period_stats = store.summary(DEFAULT_TICKER, start_date, end_date)
+    else:
+        mask = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
+        df_filtered = df[mask].copy()
+        period_stats = {
+            'days': len(df_filtered),
+            'mean_close': df_filtered['clot'].mean(),
+            'total_volume': df_filtered['vol'].sum(),
+            'first_close': df_filtered['clot'].iloc[0] if len(df_filtered) else None,
+            'last_close': df_filtered['clot'].iloc[-1] if len(df_filtered) else None,
+            'std_close': df_filtered['clot'].std()
+        }
     
     st.markdown("---")
     st.subheader("Statistiques de la période sélectionnée")
     
-    if len(df_filtered) > 0:
+    if period_stats['days'] > 0:
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.metric("Nombre de jours", len(df_filtered))
+            st.metric("Nombre de jours", period_stats['days'])
         
         with col2:
-            st.metric("Prix moyen", f"{df_filtered['clot'].mean():.2f} €")
+            st.metric("Prix moyen", f"{period_stats['mean_close']:.2f} €")
         
         with col3:
-            if len(df_filtered) > 1:
-                period_return = ((df_filtered['clot'].iloc[-1] - df_filtered['clot'].iloc[0]) / df_filtered['clot'].iloc[0] * 100)
+            if period_stats['days'] > 1:
+                period_return = ((period_stats['last_close'] - period_stats['first_close']) / period_stats['first_close'] * 100)
                 st.metric("Performance", f"{period_return:+.2f}%")
             else:
                 st.metric("Performance", "N/A")
         
         with col4:
-            st.metric("Volume total", f"{df_filtered['vol'].sum()/1000000:.2f}M")
+            st.metric("Volume total", f"{period_stats['total_volume']/1000000:.2f}M")
         
         with col5:
-            volatility_period = df_filtered['clot'].std()
+            volatility_period = period_stats['std_close']
             st.metric("Volatilité", f"{volatility_period:.2f} €")
         
         st.markdown("---")
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlcv
+from safran.alerts import DEFAULT_RULES, AlertEngine, alert_frame, parse_rule, parse_rules, replay
+from safran.pipeline import DATA_FILE, compute_indicators, load_dataset
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {
+        'SAF': load_dataset(DATA_FILE),
+        'SYN': compute_indicators(synthetic_ohlcv(1500, seed=3))
+    }
+
+
+def _side(df, operand):
+    if operand.field is None:
+        return pd.Series(operand.factor, index=df.index)
+    return operand.factor * df[operand.field]
+
+
+# Déclenchements attendus calculés directement avec pandas : croisements entre deux
+# barres consécutives, conditions de niveau au passage de faux à vrai
+def _expected_fires(df, rule):
+    left, right = _side(df, rule.left), _side(df, rule.right)
+    prev_left, prev_right = left.shift(), right.shift()
+    up = (left > right) & (prev_left <= prev_right)
+    down = (left < right) & (prev_left >= prev_right)
+    if rule.op == 'crosses above':
+        return int(up.sum())
+    if rule.op == 'crosses below':
+        return int(down.sum())
+    if rule.op == 'crosses':
+        return int((up | down).sum())
+    condition = {'>': left > right, '<': left < right, '>=': left >= right, '<=': left <= right}[rule.op]
+    return int((condition & ~condition.shift(fill_value=False)).sum())
+
+
+def test_fire_counts_match_pandas(frames):
+    rules = parse_rules(DEFAULT_RULES) + parse_rules("MACD crosses MACD_Signal\nRSI <= 35\nclot >= 1.02 * MA_20 [SYN]")
+    engine = AlertEngine(rules)
+    alerts = replay(engine, frames)
+
+    for i, rule in enumerate(rules):
+        tickers = rule.tickers or tuple(frames)
+        expected = sum(_expected_fires(alert_frame(frames[t]), rule) for t in tickers)
+        assert engine.fired[i] == expected, rule
+    assert len(alerts) == engine.fired.sum() > 0
+
+
+@pytest.mark.parametrize("text", [
+    "foo > 3",
+    "RSI crosses abov 70",
+    "RSI crosses above",
+    "Test: RSI crosses below",
+    "vol > 2 * Volume_Moyen",
+    "RSI 70",
+])
+def test_invalid_rules_are_rejected(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def test_rule_round_trip():
+    rule = parse_rule("Volume anormal: vol > 2 * Volume_MA [SAF, SYN]")
+    assert rule.tickers == ('SAF', 'SYN')
+    assert parse_rule(str(rule)) == rule
+    assert np.isclose(rule.right.factor, 2.0)
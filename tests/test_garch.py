@@ -0,0 +1,43 @@
+import threading
+
+import numpy as np
+
+from safran.garch import GarchCache
+
+
+def _returns(n, seed=0):
+    return np.random.default_rng(seed).standard_normal(n)
+
+
+# Une version déjà ajustée est resservie ; une nouvelle version repart du dernier ajustement du ticker
+def test_garch_cache_reuses_fits_and_bounds_entries():
+    cache = GarchCache(max_entries=2)
+    first = cache.get("SAF", 1, _returns(300))
+    assert cache.get("SAF", 1, _returns(300)) is first
+
+    cache.get("SAF", 2, _returns(301))
+    cache.get("AIR", 1, _returns(300, seed=1))
+    assert len(cache) == 2
+    assert cache.get("SAF", 1, _returns(300)) is not first
+
+
+# Accès concurrents depuis plusieurs sessions : le cache reste cohérent et borné
+def test_garch_cache_is_thread_safe():
+    cache = GarchCache(max_entries=4)
+    errors = []
+
+    def worker(i):
+        try:
+            for version in range(6):
+                cache.get(f"T{i % 3}", version, _returns(200, seed=version))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(cache) == 4
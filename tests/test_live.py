@@ -0,0 +1,132 @@
+import asyncio
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlcv, write_bourse_file
+from safran.live import BarAggregator, LiveFeed
+from safran.pipeline import read_bourse_file
+from safran.replay_server import bar_ticks, serve
+
+
+def _ticks(bars, ticks_per_bar=10):
+    rng = np.random.default_rng(0)
+    return [tick for bar in bars.to_dict('records') for tick in bar_ticks(bar, ticks_per_bar, rng)]
+
+
+def _aggregate(ticks):
+    aggregator = BarAggregator()
+    closed = [bar for bar in (aggregator.add(*tick) for tick in ticks) if bar is not None]
+    return closed + [aggregator.current]
+
+
+# Un flux rejoué depuis le début après une reconnexion ne modifie pas les barres,
+# y compris la barre en formation au moment de la coupure
+def test_aggregator_ignores_replayed_ticks():
+    bars = synthetic_ohlcv(5)
+    ticks = _ticks(bars)
+    expected = _aggregate(ticks)
+
+    cut = len(ticks) // 2 + 3
+    replayed = ticks[:cut] + ticks + ticks
+    assert _aggregate(replayed) == expected
+
+    assert [bar['vol'] for bar in expected] == bars['vol'].tolist()
+    assert [bar['clot'] for bar in expected] == pytest.approx(bars['clot'].tolist())
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+# Bout en bout contre le serveur de rejeu : celui-ci ferme la connexion en fin de fichier
+# et renvoie tout le flux à la reconnexion suivante
+def test_live_feed_reconnect_against_replay_server(tmp_path):
+    path = tmp_path / "bourse.txt"
+    write_bourse_file(synthetic_ohlcv(4), path)
+    bars = read_bourse_file(path)
+    port = _free_port()
+
+    loop = asyncio.new_event_loop()
+    server = loop.create_task(serve(path, "127.0.0.1", port, ticks_per_bar=5, delay=0))
+
+    def run_server():
+        try:
+            loop.run_until_complete(server)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run_server, daemon=True)
+    thread.start()
+    feed = LiveFeed(f"tcp://127.0.0.1:{port}")
+    feed.start()
+    try:
+        assert _wait(lambda: feed.ticks == 20)
+        # Au moins une reconnexion avec rejeu complet
+        time.sleep(2.5)
+        snapshot = feed.snapshot()
+    finally:
+        feed.stop()
+        loop.call_soon_threadsafe(server.cancel)
+        thread.join(timeout=2)
+
+    assert snapshot['ticks'] == 20
+    assert len(snapshot['bars']) == 3
+    assert snapshot['bars']['vol'].tolist() == bars['vol'].iloc[:3].tolist()
+    assert snapshot['current']['vol'] == bars['vol'].iloc[-1]
+
+
+# Une erreur inattendue pendant le traitement d'un tick est signalée sans arrêter le flux
+def test_live_feed_reports_unexpected_errors(tmp_path, monkeypatch):
+    path = tmp_path / "ticks.txt"
+    path.write_text("2026-01-30T09:00:00\t100.0\t10\n")
+    feed = LiveFeed(str(path))
+
+    def broken(*tick):
+        raise IndexError("tick mal formé")
+
+    monkeypatch.setattr(feed, "_on_tick", broken)
+    feed.start()
+    try:
+        assert _wait(lambda: feed.error is not None, timeout=5)
+        assert "IndexError" in feed.error
+        assert feed.running
+    finally:
+        feed.stop()
+
+
+# Un tick écrit en deux fois dans le fichier suivi n'est lu qu'une fois complet
+def test_live_feed_waits_for_complete_lines(tmp_path):
+    path = tmp_path / "ticks.txt"
+    path.write_text("2026-01-30T09:00:00\t100.0\t10\n2026-01-30T09:01:00\t101.0\t1")
+    feed = LiveFeed(str(path))
+    feed.start()
+    try:
+        assert _wait(lambda: feed.ticks == 1)
+        time.sleep(0.3)
+        assert feed.ticks == 1
+        with open(path, "a") as f:
+            f.write("000\n")
+        assert _wait(lambda: feed.ticks == 2)
+        snapshot = feed.snapshot()
+    finally:
+        feed.stop()
+
+    assert snapshot['error'] is None
+    assert snapshot['current']['vol'] == 1010
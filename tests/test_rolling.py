@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from safran.rolling import rolling_linregress
+
+
+def _random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 + 0.5 * np.cumsum(rng.normal(0, 1, n)) + 1e-3 * np.arange(n)
+
+
+def _check_against_scipy(y, window, positions):
+    fit = rolling_linregress(y, window)
+    x = np.arange(window)
+    for i in positions:
+        ref = stats.linregress(x, y[i - window + 1:i + 1])
+        assert fit['slope'].iloc[i] == pytest.approx(ref.slope, rel=1e-9)
+        assert fit['intercept'].iloc[i] == pytest.approx(ref.intercept, rel=1e-9)
+        assert fit['r2'].iloc[i] == pytest.approx(ref.rvalue ** 2, rel=1e-9, abs=1e-12)
+        assert fit['stderr'].iloc[i] == pytest.approx(ref.stderr, rel=1e-9)
+
+
+@pytest.mark.parametrize("n, window", [(30, 30), (31, 30), (65, 30), (1000, 7)])
+def test_matches_linregress(n, window):
+    y = _random_walk(n)
+    _check_against_scipy(y, window, range(window - 1, n))
+
+
+# Sur une longue série, les sommes restent locales à chaque fenêtre (pas d'annulation
+# catastrophique liée à la position dans l'historique)
+def test_matches_linregress_on_long_series():
+    n, window = 1_500_000, 30
+    y = _random_walk(n, seed=1)
+    positions = [window - 1, n // 2, n - 2, n - 1]
+    _check_against_scipy(y, window, positions)
+
+
+def test_missing_values_invalidate_their_windows():
+    y = np.arange(100.0) + np.sin(np.arange(100))
+    y[0] = np.nan
+    y[40] = np.nan
+    fit = rolling_linregress(y, 10)
+    assert fit['slope'].iloc[:10].isna().all()
+    assert fit['slope'].iloc[40:50].isna().all()
+    assert fit['slope'].iloc[50:].notna().all()
+    ref = stats.linregress(np.arange(10), y[51:61])
+    assert fit['slope'].iloc[60] == pytest.approx(ref.slope, rel=1e-12)
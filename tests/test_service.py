@@ -0,0 +1,91 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from safran.pipeline import DATA_FILE
+from safran.service import Datasets, QueryService, make_server
+
+
+@pytest.fixture()
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAFRAN_SHARED_DIR", str(tmp_path / "shared"))
+    service = QueryService(Datasets({'SAF': DATA_FILE}))
+    httpd = make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(server, path, method="GET", body=None, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        payload = response.read()
+        return response.status, response.getheader("ETag"), json.loads(payload) if payload else None
+    finally:
+        connection.close()
+
+
+def test_series_and_conditional_request(server):
+    status, etag, body = _request(server, "/series?ticker=SAF&field=clot;rsi:period=10&start=2025-06-01")
+    assert status == 200 and etag
+    result = body['results']['SAF']
+    assert len(result['date']) == len(result['clot']) == len(result['rsi:period=10'])
+
+    status, same_etag, body = _request(server, "/series?ticker=SAF&field=clot;rsi:period=10&start=2025-06-01",
+                                       headers={"If-None-Match": etag})
+    assert (status, same_etag, body) == (304, etag, None)
+
+
+# Requêtes mal formées : réponse 400 (et non connexion fermée sans réponse)
+@pytest.mark.parametrize("field", [
+    "moving_average:window=2.5",
+    "rsi:period=-3",
+    "devise",
+    "inconnu",
+    "bollinger:largeur=2",
+    "clot:window=3",
+])
+def test_malformed_fields_return_400(server, field):
+    status, _, body = _request(server, f"/series?ticker=SAF&field={field}")
+    assert status == 400
+    assert body['error']
+
+
+def test_invalid_date_returns_400(server):
+    status, _, _ = _request(server, "/kpis?ticker=SAF&start=demain")
+    assert status == 400
+
+
+@pytest.mark.parametrize("path", ["/series?ticker=XXX", "/kpis?ticker=SAF,XXX", "/inconnu"])
+def test_unknown_resources_return_404(server, path):
+    status, _, body = _request(server, path)
+    assert status == 404
+    assert body['error']
+
+
+def test_unexpected_errors_return_500(server, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("panne")
+
+    monkeypatch.setattr(server.RequestHandlerClass.service, "query", broken)
+    status, _, body = _request(server, "/kpis?ticker=SAF")
+    assert status == 500
+    assert "panne" in body['error']
+
+
+def test_batch_reports_errors_per_request(server):
+    requests = [
+        {'endpoint': 'kpis', 'tickers': ['SAF']},
+        {'endpoint': 'series', 'tickers': ['SAF'], 'fields': ['rsi:period=-3']},
+    ]
+    status, _, body = _request(server, "/batch", method="POST", body=json.dumps({'requests': requests}))
+    assert status == 200
+    first, second = body['results']
+    assert first['results']['SAF']['days'] > 0
+    assert 'error' in second
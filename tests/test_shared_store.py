@@ -0,0 +1,28 @@
+import os
+
+import pandas as pd
+
+from safran.shared_store import shared_frame, source_key
+
+
+def _build(path):
+    return pd.read_csv(path)
+
+
+# Deux sources sous la même racine : publier une nouvelle version de l'une
+# ne supprime que les versions antérieures de cette même source
+def test_shared_frame_prunes_only_the_same_source(tmp_path):
+    root = str(tmp_path / "shared")
+    first = tmp_path / "a.csv"
+    second = tmp_path / "b.csv"
+    first.write_text("x\n1\n2\n")
+    second.write_text("x\n3\n")
+
+    a1 = shared_frame(str(first), _build, root=root, fingerprint="v1")
+    b1 = shared_frame(str(second), _build, root=root, fingerprint="v1")
+    a2 = shared_frame(str(first), _build, root=root, fingerprint="v2")
+
+    assert a1['x'].tolist() == a2['x'].tolist() == [1, 2]
+    assert b1['x'].tolist() == [3]
+    assert sorted(os.listdir(os.path.join(root, source_key(str(first))))) == ["v2"]
+    assert sorted(os.listdir(os.path.join(root, source_key(str(second))))) == ["v1"]
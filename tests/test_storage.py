@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from safran.indicator_cache import INDICATORS, warmup_bars
+from safran.pipeline import load_dataset
+from safran.storage import BarStore
+
+
+@pytest.fixture()
+def bourse_file(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    dates = pd.bdate_range("2019-01-01", periods=n) + pd.Timedelta(hours=17, minutes=35)
+    frame = pd.DataFrame({
+        'date': dates.strftime('%d/%m/%Y %H:%M'),
+        'ouv': close * (1 + rng.normal(0, 0.003, n)),
+        'haut': close * 1.01,
+        'bas': close * 0.99,
+        'clot': close,
+        'vol': rng.integers(10_000, 100_000, n).astype(float),
+        'devise': 'EUR'
+    })
+    path = tmp_path / "bourse.txt"
+    frame.to_csv(path, sep="\t", index=False)
+    return str(path)
+
+
+@pytest.fixture()
+def store(tmp_path, bourse_file):
+    store = BarStore(str(tmp_path / "bars.db"))
+    store.ingest_file(bourse_file)
+    yield store
+    store.close()
+
+
+# Indicateurs enregistrés à l'ingestion identiques à ceux calculés sur le fichier
+def test_stored_indicators_match_file(store, bourse_file):
+    stored = store.query_range(indicators=True)
+    expected = load_dataset(bourse_file)
+    for column in expected.columns.drop(['date', 'devise']):
+        np.testing.assert_allclose(stored[column], expected[column], rtol=1e-12, equal_nan=True, err_msg=column)
+    assert store.garch_fit().nobs == len(expected) - 1
+
+
+# Les dernières barres et leur préchauffage suffisent pour les indicateurs paramétrables
+@pytest.mark.parametrize("bb_window, rsi_period", [(20, 14), (100, 50), (5, 2)])
+def test_tail_with_warmup_matches_full_history(store, bb_window, rsi_period):
+    days_back = 90
+    full = store.query_range(indicators=True)
+    recent = store.tail(n=days_back + warmup_bars(bb_window, rsi_period), indicators=True)
+    pd.testing.assert_frame_equal(recent.reset_index(drop=True), full.tail(len(recent)).reset_index(drop=True))
+
+    for name, params in [('bollinger', {'window': bb_window, 'width': 2.0}), ('rsi', {'period': rsi_period}), ('rsi_wilder', {'period': rsi_period})]:
+        expected = np.asarray(INDICATORS[name](full, **params))[-days_back:]
+        actual = np.asarray(INDICATORS[name](recent, **params))[-days_back:]
+        np.testing.assert_allclose(actual, expected, rtol=1e-7, err_msg=name)
+
+
+# Une nouvelle ingestion recalcule les indicateurs et l'ajustement GARCH
+def test_reingest_refreshes_indicators(store, bourse_file, tmp_path):
+    first = store.garch_fit()
+    extra = pd.read_csv(bourse_file, sep="\t").tail(1)
+    extra['date'] = "01/01/2030 17:35"
+    extra['clot'] *= 1.05
+    path = tmp_path / "extra.txt"
+    extra.to_csv(path, sep="\t", index=False)
+    store.ingest_file(str(path))
+
+    last = store.tail(n=1, indicators=True).iloc[0]
+    assert last['Daily_Return'] == pytest.approx(5.0)
+    assert store.garch_fit().nobs == first.nobs + 1